@@ -0,0 +1,33 @@
+"""
+Opt-in extraction debug log (BIDBOOK_DEBUG_EXTRACT=1).
+
+extractor and pdf_processor log under the "bidbook" logger, so both write to the
+one rotating log file configured here instead of the server's stdout/stderr.
+"""
+import logging
+import logging.handlers
+import os
+from dotenv import load_dotenv
+
+# Load environment variables (the flag may be set in .env; this module is imported first)
+load_dotenv()
+
+DEBUG_EXTRACT = os.getenv("BIDBOOK_DEBUG_EXTRACT") == "1"
+
+# Parent of every module logger returned by get_logger
+_parent_logger = logging.getLogger("bidbook")
+
+# Verbose extraction tracing (raw document text, OCR footers etc.), written to a rotating
+# log file so large dumps never block the server process
+if DEBUG_EXTRACT:
+    _debug_handler = logging.handlers.RotatingFileHandler(
+        os.getenv("BIDBOOK_DEBUG_LOG", "extract_debug.log"), maxBytes=10 * 1024 * 1024, backupCount=3
+    )
+    _debug_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _parent_logger.addHandler(_debug_handler)
+    _parent_logger.setLevel(logging.DEBUG)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return the logger for a backend module, a child of the shared "bidbook" logger."""
+    return logging.getLogger(f"bidbook.{name}")
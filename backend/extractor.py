@@ -1,14 +1,175 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 import os
 import re
-from typing import Dict, Any, Optional
+import time
+import asyncio
+import hashlib
+import threading
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 import json
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, field_validator, model_validator
+# Private SDK module (no public equivalent for a plain json_schema dict) - openai is pinned in requirements.txt
+from openai.lib._pydantic import to_strict_json_schema
+import llm_cache
+from debug_log import DEBUG_EXTRACT as _DEBUG_EXTRACT, get_logger
 
 # Load environment variables
 load_dotenv()
 
+# Verbose extraction tracing goes to the shared debug log file (see debug_log)
+logger = get_logger(__name__)
+
+OPENAI_MODEL = "gpt-4o"
+# Bump whenever the prompts or response schema change so stale cache entries are not reused
+PROMPT_VERSION = "v5"
+# Documents packed into a single OpenAI request by extract_contact_info_batch
+DEFAULT_BATCH_SIZE = int(os.getenv("OPENAI_BATCH_SIZE", "8"))
+# Concurrent OpenAI requests and client-side rate budget (match your account's limits;
+# 0 disables that budget - the token budget is opt-in since limits vary widely by tier)
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "10"))
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TPM", "0"))
+
+
+class _TokenBucket:
+    """
+    Proactive client-side throttle for OpenAI's requests-per-minute and
+    tokens-per-minute limits.
+    
+    Both budgets refill continuously on a monotonic clock; acquire() sleeps until
+    enough capacity is available instead of firing requests and retrying on 429s.
+    Holds no loop-bound primitives, so one instance is shared by every event loop.
+    A budget of 0 (or less) is not enforced.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.last_update = time.monotonic()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(self.requests_per_minute, self.available_requests + elapsed * self.requests_per_minute / 60)
+        self.available_tokens = min(self.tokens_per_minute, self.available_tokens + elapsed * self.tokens_per_minute / 60)
+    
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and `tokens` tokens are available, then consume them."""
+        requests = 1 if self.requests_per_minute > 0 else 0
+        # A single request larger than the whole budget would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute) if self.tokens_per_minute > 0 else 0
+        while True:
+            self._refill()
+            if self.available_requests >= requests and self.available_tokens >= tokens:
+                self.available_requests -= requests
+                self.available_tokens -= tokens
+                return
+            wait_seconds = max(
+                (requests - self.available_requests) * 60 / self.requests_per_minute if requests else 0,
+                (tokens - self.available_tokens) * 60 / self.tokens_per_minute if tokens else 0,
+                0.01,
+            )
+            await asyncio.sleep(wait_seconds)
+
+
+_rate_limiter = _TokenBucket(OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE)
+# asyncio.Semaphore binds to the loop it is first used on, so keep one per event loop
+_request_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+_client_lock = threading.Lock()
+# The client's httpx connection pool is bound to the event loop that opened it, so
+# keep one long-lived client (and its keep-alive connections) per event loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def _get_client(api_key: str) -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _clients.get(loop)
+        if client is None:
+            client = _clients[loop] = AsyncOpenAI(api_key=api_key)
+    return client
+
+
+def _get_request_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent OpenAI requests on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _request_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _request_semaphores[loop] = asyncio.Semaphore(OPENAI_CONCURRENCY)
+    return semaphore
+
+
+async def _discard_loop_state() -> None:
+    """
+    Drop the running event loop's request semaphore and client before the loop closes.
+    
+    A semaphore that has seen contention holds a strong reference to its loop, so
+    a short-lived loop (see extract_contact_info_batch) would never leave the weak maps.
+    """
+    loop = asyncio.get_running_loop()
+    _request_semaphores.pop(loop, None)
+    with _client_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+
+
+# Allowed confidence labels (anything else is coerced to "none")
+_VALID_CONFIDENCE = frozenset({"high", "medium", "low", "none"})
+
+# Characters dropped when normalizing a company name for domain comparison
+_COMPANY_STRIP_TABLE = str.maketrans("", "", " &,.")
+
+# Contact name patterns in table layouts (Tel Set fix), tried in order
+_CONTACT_PATTERNS = [
+    re.compile(r'(?i)(estimator|contact)\s*\n\s*([A-Za-z]+(?:\s+[A-Za-z]+)*)'),  # Vertical table layout: "Contact\nNathaniel"
+    re.compile(r'(?i)(estimator|contact)[:\s]+([A-Za-z]+(?:\s+[A-Za-z]+)*)')      # Horizontal layout: "Contact: Nathaniel" or "Contact Nathaniel"
+]
+
+# Filename terms suggesting the name has nothing to do with the proposing company
+_UNRELATED_FILENAME_RE = re.compile(r'bank|invoice|receipt|statement|report|summary', re.IGNORECASE)
+
+# Marker placed between the head and tail of long documents
+_TRUNCATION_SEP = "\n\n[...middle of document truncated...]\n\n"
+
+# Colon and opening quote that follow a key in (possibly partial) JSON text
+_JSON_STRING_START_RE = re.compile(r'\s*:\s*"')
+
+# OCR drops the dot after "www": "wwwadaltonelectric" -> "www.daltonelectric"
+_WWW_FIX_RE = re.compile(r'^www(?=[a-z])', re.IGNORECASE)
+
+
+# Trade keywords per CSI MasterFormat division, in priority order
+# IMPORTANT: Communications comes BEFORE Electrical to avoid misclassification
+_TRADE_DIVISIONS = (
+    ("Communications", ('communications', 'communication', 'telecom', 'telecommunications', 'wireless', 'cabling', 'data cabling', 'low voltage', 'structured cabling', 'network cabling', 'fiber', 'fiber optic')),
+    ("Concrete", ('concrete', 'foundation', 'slab', 'rebar', 'reinforcement', 'cement', 'pouring')),
+    ("Electrical", ('electrical', 'electric', 'lighting', 'conduit', 'power', 'wiring', 'electrical installation')),
+    ("Plumbing", ('plumbing', 'plumber', 'pipe', 'piping', 'water heater', 'fixture', 'drain', 'sewer', 'water system')),
+    ("Earthwork", ('earthwork', 'earth work', 'grading', 'excavation', 'excavate', 'sitework', 'site work', 'site prep', 'site preparation', 'dirt work', 'clearing', 'demolition')),
+    ("HVAC", ('hvac', 'h.v.a.c', 'heating', 'ventilation', 'air conditioning', 'mechanical', 'air handler', 'ductwork', 'duct work')),
+    ("General Requirements", ('general', 'general contractor', 'gc', 'project management', 'coordination', 'site coordination', 'general requirements')),
+)
+
+# Company-name keywords used to infer a missing trade, in priority order (substring match,
+# so "Plumbco" or "PowerSecure" still infer a trade)
+_COMPANY_TRADE_DIVISIONS = (
+    ("Electrical", ('electric', 'electrical', 'lighting', 'power')),
+    ("Plumbing", ('plumb', 'pipe', 'water')),
+    ("Concrete", ('concrete', 'cement', 'foundation')),
+    ("Earthwork", ('earthwork', 'excavation', 'grading', 'sitework')),
+    ("HVAC", ('hvac', 'heating', 'ventilation', 'air conditioning', 'mechanical')),
+    ("Communications", ('communication', 'telecom', 'wireless', 'cabling', 'low voltage')),
+)
+
 
 # Pydantic Models for Structured Extraction
 class FieldWithConfidence(BaseModel):
@@ -20,9 +181,22 @@ class FieldWithConfidence(BaseModel):
     @classmethod
     def validate_confidence(cls, v):
         """Validate confidence is one of the allowed values."""
-        if v not in ["high", "medium", "low", "none"]:
-            return "none"
-        return v
+        return v if v in _VALID_CONFIDENCE else "none"
+
+
+class TradeField(FieldWithConfidence):
+    """Trade field, normalized to a CSI MasterFormat division while parsing."""
+
+    @model_validator(mode='after')
+    def normalize_trade(self):
+        """Map the value to a standard division; downgrade "high" confidence if it can't be mapped."""
+        if self.value:
+            normalized_trade = _normalize_trade(self.value)
+            if normalized_trade:
+                self.value = normalized_trade
+            elif self.confidence == "high":
+                self.confidence = "medium"  # Downgrade if couldn't normalize
+        return self
 
 
 class ClientInfo(BaseModel):
@@ -31,6 +205,14 @@ class ClientInfo(BaseModel):
     contact_name: Optional[str] = None
     email: Optional[str] = None
 
+    # Normalized forms used by _validate_email_against_client, computed once per model
+    _norm_company: str = PrivateAttr(default="")
+    _lower_email: str = PrivateAttr(default="")
+
+    def model_post_init(self, __context: Any) -> None:
+        self._norm_company = (self.company_name or "").lower().translate(_COMPANY_STRIP_TABLE)
+        self._lower_email = (self.email or "").lower().strip()
+
 
 class ExtractionData(BaseModel):
     """The extracted data fields for the PROPOSER (subcontractor)."""
@@ -39,7 +221,7 @@ class ExtractionData(BaseModel):
     email: FieldWithConfidence
     phone: FieldWithConfidence
     website: FieldWithConfidence  # NEW: Website URL field
-    trade: FieldWithConfidence
+    trade: TradeField  # Normalized to a CSI division during validation
     client_info: Optional[ClientInfo] = None  # Client details for validation/debugging
 
 
@@ -49,213 +231,31 @@ class ExtractionResult(BaseModel):
     data: ExtractionData
 
 
-def extract_contact_info(text: str, filename: str, extraction_method: str = "text_extraction") -> Dict[str, Dict[str, Any]]:
-    """
-    Extract structured contact information from PDF text using OpenAI GPT-4o.
-    
-    Implements Role-Aware Chain-of-Thought extraction to correctly identify
-    the PROPOSER (subcontractor) vs CLIENT (general contractor).
-    
-    Args:
-        text: Extracted text from the PDF
-        filename: Name of the PDF file (for context, but may be unrelated)
-        extraction_method: Either "text_extraction" or "ocr" - used to adjust prompt
-        
-    Returns:
-        Dictionary with structure:
-        {
-            "company_name": {"value": "...", "confidence": "high"},
-            "contact_name": {"value": "...", "confidence": "medium"},
-            "email": {"value": "...", "confidence": "high"},
-            "phone": {"value": "...", "confidence": "low"},
-            "website": {"value": "www.company.com", "confidence": "medium"},
-            "trade": {"value": "...", "confidence": "medium"},
-            "logic_reasoning": {"value": "Reasoning explanation...", "confidence": "high"}
-        }
-        
-        If extraction fails, returns null values with "none" confidence.
-    """
-    # Load OpenAI API key from environment
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        # Return empty result if API key is missing (error handling in main.py)
-        print(f"ERROR: OPENAI_API_KEY not found in environment variables for {filename}")
-        return _get_empty_result()
-    else:
-        print(f"INFO: OpenAI API key found (length: {len(api_key)} chars, starts with: {api_key[:10]}...)")
-    
-    # DEBUG LOGGING: Print raw extracted text
-    import sys
-    print(f"\n{'='*80}")
-    print(f"=== RAW TEXT FOR {filename} ===")
-    print(f"{'='*80}")
-    print(text)
-    print(f"{'='*80}\n")
-    sys.stdout.flush()  # Force flush to ensure output appears immediately
-    
-    # Text Pre-processing: Extract contact names from table layouts (Tel Set fix)
-    # Look for patterns like "Contact: Nathaniel" in tables (vertical or horizontal layout)
-    contact_patterns = [
-        r'(?i)(estimator|contact)\s*\n\s*([A-Za-z]+(?:\s+[A-Za-z]+)*)',  # Vertical table layout: "Contact\nNathaniel"
-        r'(?i)(estimator|contact)[:\s]+([A-Za-z]+(?:\s+[A-Za-z]+)*)'      # Horizontal layout: "Contact: Nathaniel" or "Contact Nathaniel"
-    ]
-    
-    for pattern in contact_patterns:
-        matches = list(re.finditer(pattern, text))
-        if matches:
-            # Process all matches but inject after the first one to avoid duplicates
-            match = matches[0]
-            contact_name = match.group(2).strip()
-            if contact_name and len(contact_name) > 2:  # Valid name (more than 2 chars)
-                # Inject explicit contact marker
-                explicit_contact = f"\n[EXPLICIT CONTACT FOUND]: {contact_name}\n"
-                # Insert after the match to make it visible to LLM
-                text = text[:match.end()] + explicit_contact + text[match.end():]
-                print(f"DEBUG: Found explicit contact pattern: '{contact_name}' (from pattern: {pattern[:50]}...)")
-                sys.stdout.flush()
-                break  # Only process first pattern that matches
-    
-    # Smart truncation: take beginning AND end of document
-    # Contact info is often in headers (top) and signature blocks (bottom)
-    if len(text) > 8000:
-        first_part = text[:4000]
-        last_part = text[-4000:]
-        truncated_text = first_part + "\n\n[...middle of document truncated...]\n\n" + last_part
-    else:
-        truncated_text = text
-    
-    # Edge case: Check if filename is unrelated to company
-    # If filename contains common unrelated terms, warn the model
-    filename_note = ""
-    unrelated_keywords = ['bank', 'invoice', 'receipt', 'statement', 'report', 'summary']
-    if any(keyword in filename.lower() for keyword in unrelated_keywords):
-        filename_note = f"\nNOTE: The filename '{filename}' may be unrelated to the company. Rely ONLY on document contents, not the filename.\n"
-    
-    # Add OCR-specific context if needed
-    ocr_note = ""
-    if extraction_method == "ocr":
-        ocr_note = """
-NOTE: This text was extracted using OCR (Optical Character Recognition) from a scanned PDF. 
-OCR text may have formatting issues, spacing errors, or character recognition mistakes.
-Pay extra attention to:
-- Letterhead/header information at the TOP (often clearest in scanned docs)
-- Signature blocks at the BOTTOM (may have formatting quirks)
-- **PAGE FOOTERS** - Footer text may appear garbled or split across lines
-- Company names may be split across lines or have spacing issues
-- Look for patterns like "TO:" vs "FROM:" even if spacing is off
-- **Phone patterns** - Look for phone numbers even if formatting is inconsistent (e.g., "301-236-0429" may appear as "301 236 0429" or "301.236.0429")
-- **Website URLs** - May have spaces inserted (e.g., "www. daltonelectric .net" should be normalized to "www.daltonelectric.net")
-- Normalize any extracted URLs by removing spaces
+class BatchExtractionResult(BaseModel):
+    """Extraction results for a batch of documents, in prompt order."""
+    results: List[ExtractionResult]
 
-"""
-    
-    # Create the extraction prompt with Role-Aware Chain-of-Thought
-    prompt = f"""Extract contact information from the following subcontractor proposal PDF text.
-
-Filename: {filename}
-{filename_note}Extraction Method: {extraction_method.upper()}
-{ocr_note}PDF Text:
-{truncated_text}
-
-You are a Forensic Pre-Construction Analyst. Your goal is to identify TWO distinct entities:
-A. The **PROPOSER** (Subcontractor) - Look for the Logo/Header.
-B. The **CLIENT** (Recipient) - Look for 'To:', 'Attn:', or 'Submitted To'.
-
-STEP 1: ANALYZE LAYOUT (Internal Monologue in `reasoning` field)
-- Identify the HEADER/LOGO owner. (This is the PROPOSER/Subcontractor).
-- Identify the 'SUBMITTED TO' / 'ATTN' / 'TO:' block. (This is the CLIENT/Recipient - extract separately).
-- Identify the SIGNATURE block at the bottom. (Likely the Proposer's Contact).
-
-STEP 2: EXTRACT DATA - TWO ENTITIES
-
-**PROPOSER (Subcontractor) Data:**
-- **Company Name:** Must match the Header/Logo or Signature. DO NOT use names from 'To:' fields.
-- **Contact Name:** Prioritize the Signer (e.g., 'Bobby Suastegui', 'Kenny D. Moore'). Reject 'Estimating Team' or 'Project Manager' if no specific name is listed.
-- **Email:** ONLY extract emails that are:
-  - Near the signer's name in the signature block
-  - In the PROPOSER's letterhead/header
-  - In the PROPOSER's footer (often repeated on every page)
-  - Clearly associated with the PROPOSER company
-  - **CRITICAL:** If an email is found in the CLIENT block (e.g., near 'Attn:'), DO NOT put it in `proposer_email`. Put it in `client_info.email` instead.
-  - If the Proposer has no email listed (like Dalton Electric), leave `proposer_email` as null.
-  - It is better to have a NULL Proposer Email than to steal the Client's email.
-- **Phone:** Extract phone number associated with the PROPOSER. PRIORITY ORDER:
-  1. Direct/Cell number from signature block (HIGHEST PRIORITY - most useful for contact)
-  2. Main office number from header/letterhead
-  3. Phone from footer (may repeat on every page)
-  Look for phone patterns: (XXX) XXX-XXXX, XXX-XXX-XXXX, XXX.XXX.XXXX
-- **Website:** Extract website URL that belongs to the PROPOSER company:
-  - Look in headers, footers, and signature blocks
-  - Common patterns: www.companyname.com, companyname.net, companyname.org
-  - Normalize URLs by removing spaces (e.g., "www. daltonelectric .net" → "www.daltonelectric.net")
-  - Do NOT extract recipient/client websites
-- **Trade/Scope:** Normalize the work description to a CSI MasterFormat Division (e.g., 'Electrical', 'Concrete', 'Earthwork', 'Civil', 'Plumbing', 'HVAC', 'General Requirements').
-  - **CRITICAL TRADE CLASSIFICATION RULE:** DO NOT classify based on service lists in headers (e.g., "Civil > Pipeline > Communications"). Look at the Bid Line Items. If the text describes "Earthwork", "Grading", or "Concrete", select "Civil" or "Concrete"—even if the header says "Communications". Only classify as 'Communications' if the actual bid work is primarily for cabling/data/wireless. If company name contains 'Communications' but bid items are Earthwork/Civil, classify based on bid items.
-
-**CLIENT (Recipient) Data:**
-- **Company Name:** Extract from 'To:', 'Attn:', 'Submitted To:', or 'Client' sections.
-- **Contact Name:** Extract from 'Attn:' or 'Submitted To:' sections if present.
-- **Email:** Extract email addresses found in CLIENT blocks (near 'Attn:', 'TO:', 'Submitted To:').
-  - If an email is in the CLIENT block, it goes in `client_info.email`, NOT in `proposer_email`.
-
-STEP 3: CALCULATE CONFIDENCE
-- If Email is missing -> Confidence = Low.
-- If Contact Name is missing but Company is clear -> Confidence = Medium.
-- If Proposer and Client are distinct and clear -> Confidence = High.
 
-EDGE CASE HANDLING:
-- If the filename is unrelated to the company (e.g. 'Five Star Bank.pdf'), rely *only* on the document contents.
-- If multiple emails exist, identify which belongs to PROPOSER (near signer/letterhead) and which belongs to CLIENT (near 'Attn:'/'TO:').
-- **EMAIL SEPARATION:** Always separate PROPOSER and CLIENT emails. If you can only find CLIENT emails, put them in `client_info.email` and leave `proposer_email` as null.
-
-Return a JSON object with this EXACT structure:
-{{
-    "reasoning": "STEP 1 ANALYSIS: [Your internal monologue identifying PROPOSER (header/logo) and CLIENT ('TO:' block)]\\nSTEP 2 EXTRACTION: [What you extracted for PROPOSER and CLIENT, and why]\\nSTEP 3 CONFIDENCE: [How you calculated confidence]",
-    "data": {{
-        "company_name": {{"value": "...", "confidence": "high"}},
-        "contact_name": {{"value": "...", "confidence": "medium"}},
-        "email": {{"value": "...", "confidence": "high"}},
-        "phone": {{"value": "...", "confidence": "low"}},
-        "website": {{"value": "www.companyname.com", "confidence": "medium"}},
-        "trade": {{"value": "Electrical", "confidence": "medium"}},
-        "client_info": {{
-            "company_name": "Nichols Contracting",
-            "contact_name": "Tom Walker",
-            "email": "twalker@nicholscontracting.com"
-        }}
-    }}
-}}
-
-Note: `client_info` is optional. Include it if you can identify the CLIENT from the document. If no CLIENT information is found, you can omit `client_info` or set it to null.
-
-The `reasoning` field must be a detailed string explaining:
-1. Which company you identified as the PROPOSER (from header/logo/signature)
-2. Which company you identified as the CLIENT (from 'TO:'/'ATTN:' blocks) and what information you extracted for each
-3. Which contact person you identified for PROPOSER (prioritizing the signer)
-4. **CONTACT INFORMATION LOCATIONS:**
-   - Where you found phone numbers (header, footer, signature block) and which one you prioritized
-   - Where you found website URLs (header, footer) and how you normalized them
-   - **EMAIL ANALYSIS:** 
-     - Which emails you found in the document
-     - Which email belongs to the PROPOSER (and where you found it - header, footer, signature)
-     - Which email belongs to the CLIENT (and where you found it - put this in `client_info.email`, NOT `proposer_email`)
-     - If you found an email in the CLIENT block, explain why you put it in `client_info.email` instead of `proposer_email`
-5. How you calculated confidence scores
-
-Use null for values that are not found. Do not include any additional text or explanation."""
+# Structured Outputs response format: decoding is constrained to the batch schema server-side
+_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "BatchExtractionResult",
+        "schema": to_strict_json_schema(BatchExtractionResult),
+        "strict": True
+    }
+}
+# Extra attempts (with the validation error fed back to the model) before falling back
+_MAX_VALIDATION_RETRIES = 2
 
-    try:
-        client = OpenAI(api_key=api_key)
-        print(f"INFO: Calling OpenAI API for {filename}...")
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are a Forensic Pre-Construction Analyst specializing in extracting contact information from construction proposal documents.
+
+# Prompts are module constants so every request starts with the same static prefix
+# (system prompt, then shared instructions, then the per-document text), which lets
+# OpenAI's automatic prompt caching reuse the prefill across requests
+_SYSTEM_PROMPT = """You are a Forensic Pre-Construction Analyst specializing in extracting contact information from construction proposal documents.
 
 Your primary goal is to identify the **PROPOSER** (the subcontractor company sending the bid), NOT the CLIENT (the general contractor receiving the bid).
+Record the CLIENT separately in `client_info` (company name and contact name from 'To:', 'Attn:', 'Submitted To:' or 'Client' sections, plus any email found in those blocks) so its details are never mistaken for the PROPOSER's. Set `client_info` to null if no CLIENT is identified.
 
 ANALYSIS PRIORITY:
 1. **Company Name:** EXTREME PRECISION REQUIRED FOR COMPANY NAMES:
@@ -272,7 +272,7 @@ ANALYSIS PRIORITY:
 
 CRITICAL RULES:
 1. The company in the HEADER/LOGO at the TOP is the PROPOSER
-2. The company in the 'TO:' / 'ATTN:' / 'SUBMITTED TO:' block is the CLIENT - **NEVER EXTRACT THIS**
+2. The company in the 'TO:' / 'ATTN:' / 'SUBMITTED TO:' block is the CLIENT - **NEVER EXTRACT THIS as the PROPOSER** (it belongs in `client_info` only)
 3. The person who SIGNED at the BOTTOM is the PROPOSER's contact
 4. Contact info near the signer is more reliable than contact info in 'TO:' sections
 
@@ -302,6 +302,7 @@ CONTACT INFORMATION LOCATIONS - Search ALL of these areas:
    - Direct phone/cell number (PRIORITY for phone extraction)
    - Email address
    - **CRITICAL: Always check the last page for a "Submitted By", "Estimator", "Accepted By", "Signed By", "Authorized Signature", or "President" block.** This is the source of truth for the Contact Name and Email. The name found there (e.g., 'Ryan Leake', 'Rachael Bowley') is the Primary Contact if no other specific contact is found in the header. For R.E. Lee & United, the signer is often at the very end.
+   - Reject generic contacts like 'Estimating Team' or 'Project Manager' if no specific person is named.
 
 4. BODY TEXT:
    - "Contact:" or "Estimator:" fields
@@ -349,52 +350,484 @@ TRADE NORMALIZATION: You MUST normalize the trade/scope field to CSI MasterForma
 - Only classify as 'Communications' or 'Low Voltage' if the actual bid work is primarily for cabling, data, wireless, or low-voltage systems.
 - Communications/Telecom companies should NEVER be classified as 'Electrical' unless the bid is specifically for electrical work.
 
-Always return valid JSON with `reasoning` as the first field, followed by `data`."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
+CONFIDENCE SCORING:
+- If Email is missing -> Confidence = Low.
+- If Contact Name is missing but Company is clear -> Confidence = Medium.
+- If Proposer and Client are distinct and clear -> Confidence = High.
+
+EDGE CASES:
+- If a filename is unrelated to the company (e.g. 'Five Star Bank.pdf'), rely *only* on the document contents.
+
+REASONING FIELD: The `reasoning` field (your internal monologue, written BEFORE `data`) must explain:
+1. STEP 1 ANALYSIS: Which company is the PROPOSER (header/logo/signature) and which is the CLIENT ('TO:'/'ATTN:' blocks)
+2. STEP 2 EXTRACTION: Which contact person you chose for the PROPOSER (prioritizing the signer); where you found phone numbers and website URLs (header, footer, signature block), which you prioritized and how you normalized them; which emails you found and why each belongs to the PROPOSER or to `client_info.email`
+3. STEP 3 CONFIDENCE: How you calculated confidence scores
+
+BATCHES: The user message may contain several documents, each starting with a `===DOC i filename=... method=...===` header. Treat every document independently - never mix information between documents - and return exactly one entry in `results` per document, in DOC order.
+
+Always return valid JSON. In every extraction result, put `reasoning` as the first field, followed by `data`. Use null for values that are not found."""
+
+_USER_PROMPT_PREFIX = """Extract contact information from each of the subcontractor proposal PDF texts below.
+
+Return a JSON object with this structure, containing exactly one entry in `results` per document, in DOC order:
+{
+    "results": [
+        {
+            "reasoning": "STEP 1 ANALYSIS: ...\\nSTEP 2 EXTRACTION: ...\\nSTEP 3 CONFIDENCE: ...",
+            "data": {
+                "company_name": {"value": "...", "confidence": "high"},
+                "contact_name": {"value": "...", "confidence": "medium"},
+                "email": {"value": "...", "confidence": "high"},
+                "phone": {"value": "...", "confidence": "low"},
+                "website": {"value": "www.companyname.com", "confidence": "medium"},
+                "trade": {"value": "Electrical", "confidence": "medium"},
+                "client_info": {
+                    "company_name": "Nichols Contracting",
+                    "contact_name": "Tom Walker",
+                    "email": "twalker@nicholscontracting.com"
                 }
-            ],
-            temperature=0,
-            response_format={"type": "json_object"}
-        )
+            }
+        }
+    ]
+}
+"""
+
+
+def extract_contact_info(text: str, filename: str, extraction_method: str = "text_extraction") -> Dict[str, Dict[str, Any]]:
+    """
+    Extract structured contact information from PDF text using OpenAI GPT-4o.
+    
+    Implements Role-Aware Chain-of-Thought extraction to correctly identify
+    the PROPOSER (subcontractor) vs CLIENT (general contractor).
+    Thin wrapper around extract_contact_info_batch with a single document.
+    
+    Args:
+        text: Extracted text from the PDF
+        filename: Name of the PDF file (for context, but may be unrelated)
+        extraction_method: Either "text_extraction" or "ocr" - used to adjust prompt
+        
+    Returns:
+        Dictionary with structure:
+        {
+            "company_name": {"value": "...", "confidence": "high"},
+            "contact_name": {"value": "...", "confidence": "medium"},
+            "email": {"value": "...", "confidence": "high"},
+            "phone": {"value": "...", "confidence": "low"},
+            "website": {"value": "www.company.com", "confidence": "medium"},
+            "trade": {"value": "...", "confidence": "medium"},
+            "logic_reasoning": {"value": "Reasoning explanation...", "confidence": "high"}
+        }
+        
+        If extraction fails, returns null values with "none" confidence.
+    """
+    return extract_contact_info_batch([(text, filename, extraction_method)], batch_size=1)[0]
+
+
+def extract_contact_info_batch(items: List[Tuple[str, str, str]], batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Synchronous wrapper around extract_contact_info_batch_async.
+    
+    Must not be called from a running event loop (use the async variant there).
+    """
+    async def run() -> List[Dict[str, Dict[str, Any]]]:
+        try:
+            return await extract_contact_info_batch_async(items, batch_size)
+        finally:
+            # asyncio.run closes this loop on return, so release everything bound to it
+            await _discard_loop_state()
+    
+    return asyncio.run(run())
+
+
+async def extract_contact_info_async(text: str, filename: str, extraction_method: str = "text_extraction") -> Dict[str, Dict[str, Any]]:
+    """
+    Async variant of extract_contact_info. Concurrent calls (e.g. via asyncio.gather)
+    share the request pool and rate limiter.
+    """
+    return (await extract_contact_info_batch_async([(text, filename, extraction_method)], batch_size=1))[0]
+
+
+async def extract_contact_info_batch_async(items: List[Tuple[str, str, str]], batch_size: int = DEFAULT_BATCH_SIZE, on_content: Optional[Callable[[str], None]] = None) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Extract contact information for several PDFs, packing up to `batch_size`
+    documents into each OpenAI request.
+    
+    Each document gets a numbered `===DOC i ...===` section in a shared prompt and
+    the model returns one ExtractionResult per document in a `results` array.
+    Batching amortizes the per-request overhead (network, prompt prefill, RPM limits)
+    across documents. Documents already in the LLM cache are not sent at all.
+    Batches are issued concurrently, bounded by OPENAI_CONCURRENCY and throttled
+    to the OPENAI_RPM / OPENAI_TPM budget.
+    
+    Args:
+        items: List of (text, filename, extraction_method) tuples
+        batch_size: Maximum number of documents per OpenAI request
+        on_content: Optional callback receiving the accumulated raw response text
+            of each streamed OpenAI request (see stream_contact_info)
+        
+    Returns:
+        List of result dicts (same format as extract_contact_info), in input order
+    """
+    if not items:
+        return []
+    
+    # Load OpenAI API key from environment
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        # Return empty result if API key is missing (error handling in main.py)
+        print(f"ERROR: OPENAI_API_KEY not found in environment variables for {', '.join(item[1] for item in items)}")
+        return [_get_empty_result() for _ in items]
+    else:
+        print(f"INFO: OpenAI API key found (length: {len(api_key)} chars, starts with: {api_key[:10]}...)")
+    
+    results: List[Optional[Dict[str, Dict[str, Any]]]] = [None] * len(items)
+    pending = []  # (index, filename, extraction_method, document_text, cache_key)
+    
+    for index, (text, filename, extraction_method) in enumerate(items):
+        document_text = _build_document_text(text, filename, extraction_method)
+        
+        # Content-addressable cache: identical inputs skip the OpenAI round-trip entirely
+        cache_key = hashlib.sha256(
+            "|".join((PROMPT_VERSION, OPENAI_MODEL, _SYSTEM_PROMPT, _USER_PROMPT_PREFIX, filename, extraction_method, document_text)).encode()
+        ).hexdigest()
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            try:
+                extraction_result = ExtractionResult.model_validate(cached)
+                print(f"INFO: LLM cache hit for {filename} ({cache_key[:12]})")
+                results[index] = _convert_to_dict_format(extraction_result)
+                continue
+            except Exception as e:
+                print(f"WARNING: Ignoring invalid LLM cache entry for {filename}: {str(e)}")
+        
+        pending.append((index, filename, extraction_method, document_text, cache_key))
+    
+    batch_size = max(1, batch_size)
+    chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+    chunk_results = await asyncio.gather(*(_extract_chunk(api_key, chunk, on_content) for chunk in chunks), return_exceptions=True)
+    for chunk, converted_results in zip(chunks, chunk_results):
+        if isinstance(converted_results, BaseException):
+            # One failed chunk must not take down the other chunks' results
+            print(f"ERROR: Extraction failed for {', '.join(entry[1] for entry in chunk)}: {str(converted_results)}")
+            converted_results = [_get_empty_result() for _ in chunk]
+        for (index, _, _, _, _), result in zip(chunk, converted_results):
+            results[index] = result
+    
+    return results
+
+
+async def stream_contact_info(text: str, filename: str, extraction_method: str = "text_extraction") -> AsyncIterator[Dict[str, Any]]:
+    """
+    Extract contact information for one PDF, surfacing the model's reasoning while
+    the response is still being generated (for interactive single-file uploads).
+    
+    Yields:
+        {"type": "reasoning", "delta": "..."} events as new reasoning text arrives,
+        then a final {"type": "result", "data": <extract_contact_info result>}.
+        Cache hits yield the result immediately. If the request is retried after a
+        validation failure, the reasoning stream restarts from the beginning.
+    """
+    deltas: asyncio.Queue = asyncio.Queue()
+    emitted = 0
+    
+    def on_content(result_text: str) -> None:
+        nonlocal emitted
+        reasoning = _partial_json_string(result_text, "reasoning") or ""
+        if len(reasoning) < emitted:
+            emitted = 0  # New attempt after a validation retry
+        if len(reasoning) > emitted:
+            deltas.put_nowait(reasoning[emitted:])
+            emitted = len(reasoning)
+    
+    task = asyncio.create_task(
+        extract_contact_info_batch_async([(text, filename, extraction_method)], batch_size=1, on_content=on_content)
+    )
+    try:
+        while not task.done():
+            getter = asyncio.ensure_future(deltas.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield {"type": "reasoning", "delta": getter.result()}
+            else:
+                getter.cancel()
+        while not deltas.empty():
+            yield {"type": "reasoning", "delta": deltas.get_nowait()}
+        yield {"type": "result", "data": task.result()[0]}
+    finally:
+        # Client disconnected mid-stream: don't leave the OpenAI request running
+        if not task.done():
+            task.cancel()
+
+
+def _partial_json_string(buffer: str, key: str) -> Optional[str]:
+    """
+    Decode the (possibly still incomplete) value of the first string field `key`
+    in a partially received JSON document.
+    
+    Args:
+        buffer: JSON text received so far
+        key: Field name to look for
+        
+    Returns:
+        The decoded string received so far, or None if the field hasn't started yet
+    """
+    start = buffer.find(f'"{key}"')
+    if start == -1:
+        return None
+    match = _JSON_STRING_START_RE.match(buffer, start + len(key) + 2)
+    if not match:
+        return None
+    
+    # Walk to the closing quote (or end of buffer), stepping over escape sequences
+    i = match.end()
+    end = len(buffer)
+    while i < len(buffer):
+        char = buffer[i]
+        if char == '"':
+            end = i
+            break
+        if char == '\\':
+            escape_length = 6 if buffer[i + 1:i + 2] == 'u' else 2
+            if i + escape_length > len(buffer):
+                end = i  # Escape sequence not fully received yet
+                break
+            i += escape_length
+        else:
+            i += 1
+    
+    try:
+        value = json.loads(f'"{buffer[match.end():end]}"')
+    except ValueError:
+        return None
+    # Drop the first half of a surrogate pair whose second half hasn't arrived yet
+    if value and '\ud800' <= value[-1] <= '\udbff':
+        value = value[:-1]
+    return value
+
+
+def _build_document_text(text: str, filename: str, extraction_method: str) -> str:
+    """
+    Pre-process and truncate one document's text and prepend its per-document notes.
+    
+    Args:
+        text: Extracted text from the PDF
+        filename: Name of the PDF file
+        extraction_method: Either "text_extraction" or "ocr"
+        
+    Returns:
+        Document body to place under the document's `===DOC i ...===` header
+    """
+    # DEBUG LOGGING: Dump raw extracted text (opt-in; can be 100KB+ per document)
+    if _DEBUG_EXTRACT:
+        logger.debug("RAW TEXT FOR %s:\n%s", filename, text)
+    
+    # Text Pre-processing: Extract contact names from table layouts (Tel Set fix)
+    # Look for patterns like "Contact: Nathaniel" in tables (vertical or horizontal layout)
+    for pattern in _CONTACT_PATTERNS:
+        # Only the first match is used (injecting after every match would duplicate markers)
+        match = pattern.search(text)
+        if match:
+            contact_name = match.group(2).strip()
+            if contact_name and len(contact_name) > 2:  # Valid name (more than 2 chars)
+                # Inject explicit contact marker
+                explicit_contact = f"\n[EXPLICIT CONTACT FOUND]: {contact_name}\n"
+                # Insert after the match to make it visible to LLM
+                text = text[:match.end()] + explicit_contact + text[match.end():]
+                if _DEBUG_EXTRACT:
+                    logger.debug("Found explicit contact pattern: '%s' (from pattern: %s...)", contact_name, pattern.pattern[:50])
+                break  # Only process first pattern that matches
+    
+    # Smart truncation: take beginning AND end of document
+    # Contact info is often in headers (top) and signature blocks (bottom)
+    if len(text) <= 8000:
+        truncated_text = text
+    else:
+        truncated_text = "".join((text[:4000], _TRUNCATION_SEP, text[-4000:]))
+    
+    # Edge case: Check if filename is unrelated to company
+    # If filename contains common unrelated terms, warn the model
+    filename_note = ""
+    if _UNRELATED_FILENAME_RE.search(filename):
+        filename_note = f"\nNOTE: The filename '{filename}' may be unrelated to the company. Rely ONLY on document contents, not the filename.\n"
+    
+    # Add OCR-specific context if needed
+    ocr_note = ""
+    if extraction_method == "ocr":
+        ocr_note = """
+NOTE: This text was extracted using OCR (Optical Character Recognition) from a scanned PDF. 
+OCR text may have formatting issues, spacing errors, or character recognition mistakes.
+Pay extra attention to:
+- Letterhead/header information at the TOP (often clearest in scanned docs)
+- Signature blocks at the BOTTOM (may have formatting quirks)
+- **PAGE FOOTERS** - Footer text may appear garbled or split across lines
+- Company names may be split across lines or have spacing issues
+- Look for patterns like "TO:" vs "FROM:" even if spacing is off
+- **Phone patterns** - Look for phone numbers even if formatting is inconsistent (e.g., "301-236-0429" may appear as "301 236 0429" or "301.236.0429")
+- **Website URLs** - May have spaces inserted (e.g., "www. daltonelectric .net" should be normalized to "www.daltonelectric.net")
+- Normalize any extracted URLs by removing spaces
+
+"""
+    
+    return f"{filename_note}{ocr_note}{truncated_text}"
+
+
+def _build_batch_prompt(documents: List[Tuple[str, str, str]]) -> str:
+    """
+    Build the Role-Aware Chain-of-Thought extraction prompt for a batch of documents.
+    
+    Args:
+        documents: List of (filename, extraction_method, document_text) tuples
+        
+    Returns:
+        User prompt containing the shared instructions followed by one
+        numbered section per document
+    """
+    document_sections = "".join(
+        f"\n===DOC {i} filename={filename} method={extraction_method.upper()}===\n{document_text}\n"
+        for i, (filename, extraction_method, document_text) in enumerate(documents, start=1)
+    )
+    
+    return _USER_PROMPT_PREFIX + document_sections
+
+
+async def _extract_chunk(api_key: str, chunk: List[Tuple[int, str, str, str, str]], on_content: Optional[Callable[[str], None]] = None) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Run one OpenAI request for a chunk of documents and map the results back by position.
+    
+    The response is schema-constrained (Structured Outputs). If it still fails
+    validation or has the wrong number of results, the error is fed back to the
+    model and the request retried up to _MAX_VALIDATION_RETRIES times.
+    
+    Args:
+        api_key: OpenAI API key
+        chunk: List of (index, filename, extraction_method, document_text, cache_key) tuples
+        on_content: Optional callback invoked with the accumulated response text
+            after every streamed delta
+        
+    Returns:
+        One result dict per chunk entry, in the same order. Documents the model
+        skipped or returned malformed data for get the empty/fallback result.
+    """
+    filenames = ", ".join(entry[1] for entry in chunk)
+    prompt = _build_batch_prompt([(filename, extraction_method, document_text) for _, filename, extraction_method, document_text, _ in chunk])
+    messages = [
+        {
+            "role": "system",
+            "content": _SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+    client = _get_client(api_key)
+    
+    for attempt in range(1 + _MAX_VALIDATION_RETRIES):
+        try:
+            async with _get_request_semaphore():
+                # Rough token estimate (~4 chars per token) for proactive TPM throttling
+                await _rate_limiter.acquire(sum(len(message["content"]) for message in messages) // 4)
+                print(f"INFO: Calling OpenAI API for {filenames} ({len(chunk)} document(s), attempt {attempt + 1})...")
+                
+                # Structured Outputs: the API constrains decoding to the BatchExtractionResult schema.
+                # Streamed so on_content consumers see the response as it is generated.
+                stream = await client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=messages,
+                    temperature=0,
+                    response_format=_BATCH_RESPONSE_FORMAT,
+                    stream=True
+                )
+                result_text = ""
+                refusal = ""
+                async for event in stream:
+                    if not event.choices:
+                        continue
+                    delta = event.choices[0].delta
+                    if getattr(delta, "refusal", None):
+                        refusal += delta.refusal
+                    if delta.content:
+                        result_text += delta.content
+                        if on_content is not None:
+                            on_content(result_text)
+        except Exception as e:
+            # Catch any OpenAI API errors
+            print(f"ERROR: Extraction failed for {filenames}: {str(e)}")
+            print(f"Error type: {type(e).__name__}")
+            import traceback
+            print("="*80)
+            print("FULL TRACEBACK:")
+            traceback.print_exc()
+            print("="*80)
+            return [_get_empty_result() for _ in chunk]
         
-        # Parse the JSON response
-        result_text = response.choices[0].message.content
-        print(f"INFO: OpenAI API response received for {filename} (length: {len(result_text)} chars)")
+        if not result_text:
+            print(f"ERROR: OpenAI returned no content for {filenames} (refusal: {refusal or None})")
+            return [_get_empty_result() for _ in chunk]
+        print(f"INFO: OpenAI API response received for {filenames} (length: {len(result_text)} chars)")
         print(f"INFO: Response preview: {result_text[:200]}...")
         
+        # Parse and validate the whole batch in one step (invalid JSON also raises ValidationError)
+        try:
+            batch_result = BatchExtractionResult.model_validate_json(result_text)
+        except ValidationError as e:
+            print(f"WARNING: Pydantic batch validation failed for {filenames} (attempt {attempt + 1}): {str(e)}")
+            feedback = f"Your previous response failed validation:\n{str(e)}\nReturn the corrected JSON object."
+        else:
+            if len(batch_result.results) == len(chunk):
+                converted_results = []
+                for (_, filename, _, _, cache_key), extraction_result in zip(chunk, batch_result.results):
+                    llm_cache.set(cache_key, extraction_result.model_dump())
+                    converted_result = _convert_to_dict_format(extraction_result)
+                    print(f"INFO: Successfully extracted data for {filename}: company={converted_result.get('company_name', {}).get('value', 'None')}")
+                    converted_results.append(converted_result)
+                return converted_results
+            print(f"WARNING: Expected {len(chunk)} results for {filenames}, got {len(batch_result.results)} (attempt {attempt + 1})")
+            feedback = f"Your previous response contained {len(batch_result.results)} results, but there are {len(chunk)} documents. Return exactly one entry in `results` per document, in DOC order."
+        
+        # Retry with the validation error as feedback
+        messages = messages + [
+            {"role": "assistant", "content": result_text},
+            {"role": "user", "content": feedback}
+        ]
+    
+    try:
         result_dict = json.loads(result_text)
+    except json.JSONDecodeError as e:
+        # If OpenAI returns invalid JSON, return empty results
+        print(f"ERROR: JSON decode error in extractor for {filenames}: {str(e)}")
+        print(f"Response content: {result_text[:500]}")
+        return [_get_empty_result() for _ in chunk]
+    
+    # Retries exhausted: validate per document and salvage what we can from each entry
+    raw_results = result_dict.get("results") if isinstance(result_dict, dict) else None
+    if not isinstance(raw_results, list):
+        raw_results = []
+    
+    converted_results = []
+    for position, (_, filename, _, _, cache_key) in enumerate(chunk):
+        if position >= len(raw_results) or not isinstance(raw_results[position], dict):
+            print(f"ERROR: No result returned for {filename}")
+            converted_results.append(_get_empty_result())
+            continue
         
-        # Validate with Pydantic
+        raw_result = raw_results[position]
         try:
-            extraction_result = ExtractionResult(**result_dict)
-            # Convert Pydantic model to dict format expected by main.py
-            converted_result = _convert_to_dict_format(extraction_result)
-            print(f"INFO: Successfully extracted data for {filename}: company={converted_result.get('company_name', {}).get('value', 'None')}")
-            return converted_result
+            extraction_result = ExtractionResult.model_validate(raw_result)
+            llm_cache.set(cache_key, extraction_result.model_dump())
+            converted_results.append(_convert_to_dict_format(extraction_result))
         except Exception as e:
             # If Pydantic validation fails, try to extract what we can
             print(f"WARNING: Pydantic validation failed for {filename}, using fallback: {str(e)}")
-            print(f"DEBUG: Result dict keys: {result_dict.keys() if isinstance(result_dict, dict) else 'Not a dict'}")
-            return _normalize_result_fallback(result_dict)
-        
-    except json.JSONDecodeError as e:
-        # If OpenAI returns invalid JSON, return empty result
-        print(f"ERROR: JSON decode error in extractor for {filename}: {str(e)}")
-        print(f"Response content: {response.choices[0].message.content[:500] if 'response' in locals() else 'No response'}")
-        return _get_empty_result()
-    except Exception as e:
-        # Catch any other OpenAI API errors
-        print(f"ERROR: Extraction failed for {filename}: {str(e)}")
-        print(f"Error type: {type(e).__name__}")
-        import traceback
-        print("="*80)
-        print("FULL TRACEBACK:")
-        traceback.print_exc()
-        print("="*80)
-        return _get_empty_result()
+            print(f"DEBUG: Result dict keys: {raw_result.keys()}")
+            try:
+                converted_results.append(_normalize_result_fallback(raw_result))
+            except Exception as fallback_error:
+                # A malformed entry only costs this document its result, not the whole batch
+                print(f"ERROR: Fallback normalization failed for {filename}: {str(fallback_error)}")
+                converted_results.append(_get_empty_result())
+    
+    return converted_results
 
 
 def _fix_malformed_url(url: Optional[str]) -> Optional[str]:
@@ -414,12 +847,11 @@ def _fix_malformed_url(url: Optional[str]) -> Optional[str]:
     
     # Fix: www followed immediately by letter (no dot) -> insert dot
     # Pattern: "wwwadaltonelectric" -> "www.daltonelectric"
-    fixed_url = re.sub(r'^www(?=[a-z])', 'www.', url, flags=re.IGNORECASE)
+    fixed_url = _WWW_FIX_RE.sub('www.', url)
     
     if fixed_url != url:
-        print(f"DEBUG: Fixed malformed URL: '{url}' -> '{fixed_url}'")
-        import sys
-        sys.stdout.flush()
+        if _DEBUG_EXTRACT:
+            logger.debug("Fixed malformed URL: '%s' -> '%s'", url, fixed_url)
     
     return fixed_url
 
@@ -443,7 +875,7 @@ def _validate_email_against_client(email: Optional[str], proposer_company: Optio
     
     # If we have explicit client_info, check if email matches client email
     if client_info and client_info.email:
-        if email.lower().strip() == client_info.email.lower().strip():
+        if email.lower().strip() == client_info._lower_email:
             # This is the client's email - reject it
             return None
     
@@ -451,7 +883,7 @@ def _validate_email_against_client(email: Optional[str], proposer_company: Optio
     if client_info and client_info.company_name:
         email_lower = email.lower()
         email_domain = email_lower.split('@')[1] if '@' in email_lower else ''
-        client_company_normalized = client_info.company_name.lower().replace(' ', '').replace('&', '').replace(',', '').replace('.', '')
+        client_company_normalized = client_info._norm_company
         domain_normalized = email_domain.replace('.com', '').replace('.net', '').replace('.org', '')
         
         # Check if domain matches client company
@@ -510,15 +942,8 @@ def _convert_to_dict_format(extraction_result: ExtractionResult) -> Dict[str, Di
         }
     }
     
-    # Apply trade normalization
-    if result["trade"]["value"]:
-        normalized_trade = _normalize_trade(result["trade"]["value"])
-        if normalized_trade:
-            result["trade"]["value"] = normalized_trade
-        elif result["trade"]["confidence"] == "high":
-            result["trade"]["confidence"] = "medium"  # Downgrade if couldn't normalize
-    else:
-        # Fallback: If trade is missing, try to infer from company name
+    # Trade is already normalized by TradeField; if missing, try to infer from company name
+    if not result["trade"]["value"]:
         inferred_trade = _infer_trade_from_company_name(proposer_company)
         if inferred_trade:
             result["trade"]["value"] = inferred_trade
@@ -554,13 +979,15 @@ def _normalize_result_fallback(result_dict: Dict[str, Any]) -> Dict[str, Dict[st
     normalized = {}
     proposer_company = None
     
+    data_get = data.get
     for field in fields:
-        if field in data and isinstance(data[field], dict):
-            value = data[field].get("value")
-            confidence = data[field].get("confidence", "none")
+        field_data = data_get(field)
+        if isinstance(field_data, dict):
+            value = field_data.get("value")
+            confidence = field_data.get("confidence", "none")
             
             # Validate confidence value
-            if confidence not in ["high", "medium", "low", "none"]:
+            if confidence not in _VALID_CONFIDENCE:
                 confidence = "none"
             
             # Store proposer company for email validation
@@ -578,14 +1005,15 @@ def _normalize_result_fallback(result_dict: Dict[str, Any]) -> Dict[str, Dict[st
             if field == "website" and value:
                 value = _fix_malformed_url(value)
             
-            # Special handling for trade field
+            # Special handling for trade field (same normalization as TradeField)
             if field == "trade":
+                if not isinstance(value, str):
+                    # Malformed (non-string) trade: treat as missing rather than fail validation
+                    value = None
+                    confidence = "none"
                 if value:
-                    normalized_value = _normalize_trade(value)
-                    if normalized_value:
-                        value = normalized_value
-                    elif confidence == "high":
-                        confidence = "medium"
+                    trade_field = TradeField(value=value, confidence=confidence)
+                    value, confidence = trade_field.value, trade_field.confidence
                 else:
                     # Fallback: If trade is missing, try to infer from company name
                     if proposer_company:
@@ -627,19 +1055,10 @@ def _infer_trade_from_company_name(company_name: Optional[str]) -> Optional[str]
     
     company_lower = company_name.lower()
     
-    # Company name keyword patterns
-    if any(keyword in company_lower for keyword in ['electric', 'electrical', 'lighting', 'power']):
-        return "Electrical"
-    elif any(keyword in company_lower for keyword in ['plumb', 'pipe', 'water']):
-        return "Plumbing"
-    elif any(keyword in company_lower for keyword in ['concrete', 'cement', 'foundation']):
-        return "Concrete"
-    elif any(keyword in company_lower for keyword in ['earthwork', 'excavation', 'grading', 'sitework']):
-        return "Earthwork"
-    elif any(keyword in company_lower for keyword in ['hvac', 'heating', 'ventilation', 'air conditioning', 'mechanical']):
-        return "HVAC"
-    elif any(keyword in company_lower for keyword in ['communication', 'telecom', 'wireless', 'cabling', 'low voltage']):
-        return "Communications"
+    # Company name keyword patterns, in priority order
+    for division, keywords in _COMPANY_TRADE_DIVISIONS:
+        if any(keyword in company_lower for keyword in keywords):
+            return division
     
     return None
 
@@ -666,40 +1085,12 @@ def _normalize_trade(trade_value: str) -> Optional[str]:
     if not trade_value:
         return None
     
-    trade_lower = trade_value.lower().strip()
-    
-    # Check for explicit "wireless & communications" or similar patterns first
-    if 'wireless' in trade_lower and 'communication' in trade_lower:
-        return "Communications"
-    if 'wireless & communication' in trade_lower:
-        return "Communications"
-    
-    # Define mapping rules for each division
-    # IMPORTANT: Check Communications BEFORE Electrical to avoid misclassification
-    communications_keywords = ['communications', 'communication', 'telecom', 'telecommunications', 'wireless', 'cabling', 'data cabling', 'low voltage', 'structured cabling', 'network cabling', 'fiber', 'fiber optic']
-    concrete_keywords = ['concrete', 'foundation', 'slab', 'rebar', 'reinforcement', 'cement', 'pouring']
-    electrical_keywords = ['electrical', 'electric', 'lighting', 'conduit', 'power', 'wiring', 'electrical installation']
-    plumbing_keywords = ['plumbing', 'plumber', 'pipe', 'piping', 'water heater', 'fixture', 'drain', 'sewer', 'water system']
-    earthwork_keywords = ['earthwork', 'earth work', 'grading', 'excavation', 'excavate', 'sitework', 'site work', 'site prep', 'site preparation', 'dirt work', 'clearing', 'demolition']
-    hvac_keywords = ['hvac', 'h.v.a.c', 'heating', 'ventilation', 'air conditioning', 'mechanical', 'air handler', 'ductwork', 'duct work']
-    general_keywords = ['general', 'general contractor', 'gc', 'project management', 'coordination', 'site coordination', 'general requirements']
-    
-    # Check each division's keywords
-    # Check Communications FIRST to avoid misclassifying as Electrical
-    if any(keyword in trade_lower for keyword in communications_keywords):
-        return "Communications"
-    elif any(keyword in trade_lower for keyword in concrete_keywords):
-        return "Concrete"
-    elif any(keyword in trade_lower for keyword in electrical_keywords):
-        return "Electrical"
-    elif any(keyword in trade_lower for keyword in plumbing_keywords):
-        return "Plumbing"
-    elif any(keyword in trade_lower for keyword in earthwork_keywords):
-        return "Earthwork"
-    elif any(keyword in trade_lower for keyword in hvac_keywords):
-        return "HVAC"
-    elif any(keyword in trade_lower for keyword in general_keywords):
-        return "General Requirements"
+    trade_lower = trade_value.lower()
+    
+    # Check each division's keywords in priority order (Communications before Electrical)
+    for division, keywords in _TRADE_DIVISIONS:
+        if any(keyword in trade_lower for keyword in keywords):
+            return division
     
     # If no match found, return None (will be handled as "none" confidence)
     return None
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+# Cache location and lifetime (override via environment)
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+
+# Most recently used entries are also kept in process memory (0 disables)
+MEMORY_CACHE_SIZE = int(os.getenv("LLM_CACHE_MEMORY_SIZE", "1024"))
+
+# key -> (stored_at, value), least recently used first
+_memory: "OrderedDict[str, tuple]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _path_for(key: str) -> str:
+    """Return the on-disk path for a cache key, sharded by the first two hex chars."""
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+
+def _remember(key: str, value: Dict[str, Any], stored_at: float) -> None:
+    """Put an entry in the in-memory LRU, evicting the least recently used if full."""
+    if MEMORY_CACHE_SIZE <= 0:
+        return
+    with _memory_lock:
+        _memory[key] = (stored_at, value)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached LLM response.
+
+    Checks the in-memory LRU first, then the on-disk cache.
+
+    Args:
+        key: Hex digest identifying the request (see extractor.extract_contact_info)
+
+    Returns:
+        The cached response dict, or None on miss, expiry, or unreadable entry
+    """
+    with _memory_lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if CACHE_TTL_SECONDS > 0 and time.time() - stored_at > CACHE_TTL_SECONDS:
+                del _memory[key]
+            else:
+                _memory.move_to_end(key)
+                return value
+
+    path = _path_for(key)
+    try:
+        stored_at = os.path.getmtime(path)
+        if CACHE_TTL_SECONDS > 0 and time.time() - stored_at > CACHE_TTL_SECONDS:
+            os.remove(path)
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _remember(key, value, stored_at)
+    return value
+
+
+def set(key: str, value: Dict[str, Any]) -> None:
+    """
+    Store an LLM response in the cache.
+
+    Writes to a temp file and renames it into place so concurrent readers
+    never see a partially written entry. Failures are swallowed - the cache
+    is an optimization, not a source of truth.
+
+    Args:
+        key: Hex digest identifying the request
+        value: JSON-serializable response dict
+    """
+    _remember(key, value, time.time())
+    path = _path_for(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"WARNING: Failed to write LLM cache entry {key[:12]}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
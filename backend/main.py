@@ -1,16 +1,32 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Tuple
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Tuple, Union
 import os
+import asyncio
+import json
 import tempfile
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
 from pdf_processor import extract_text_from_pdf
-from extractor import extract_contact_info
-from difflib import SequenceMatcher
+from extractor import extract_contact_info_batch_async, stream_contact_info
 
 load_dotenv()
 
-app = FastAPI()
+# PDFs processed at once across all requests (each may hold 300 DPI page renders in memory)
+PDF_PROCESSING_CONCURRENCY = int(os.getenv("PDF_PROCESSING_CONCURRENCY", "4"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Created here so the semaphore belongs to the serving event loop
+    app.state.pdf_slots = asyncio.Semaphore(max(1, PDF_PROCESSING_CONCURRENCY))
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS - allow Vercel origins (all .vercel.app domains) and localhost
 import re
@@ -43,6 +59,14 @@ app.add_middleware(
 UPLOADS_DIR = "uploads"
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
+# Uploads are copied to disk in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+# Trailing legal-entity suffixes ("acme co. inc" -> "acme") and non-alphanumeric characters
+_SUFFIX_RE = re.compile(r'(?:\s+(?:inc|llc|corp|ltd|co)\.?)+$')
+_PUNCT_RE = re.compile(r'[^\w\s]|_')
+
 
 def normalize_company_name(name: str) -> str:
     """Normalize company name for comparison (lowercase, remove common suffixes, punctuation)."""
@@ -50,22 +74,66 @@ def normalize_company_name(name: str) -> str:
         return ""
     normalized = name.lower().strip()
     # Remove common suffixes
-    suffixes = [" inc", " inc.", " llc", " llc.", " corp", " corp.", " ltd", " ltd.", " co", " co."]
-    for suffix in suffixes:
-        if normalized.endswith(suffix):
-            normalized = normalized[:-len(suffix)].strip()
+    normalized = _SUFFIX_RE.sub('', normalized).strip()
     # Remove punctuation
-    normalized = ''.join(c for c in normalized if c.isalnum() or c.isspace())
-    return normalized
+    return _PUNCT_RE.sub('', normalized)
+
+
+# Jaccard similarity of name shingles at or above which two companies are merged
+SIMILARITY_THRESHOLD = 0.6
+
+# Above this many named proposals, matching pairs come from an exact inverted shingle
+# index instead of comparing all pairs
+INDEX_MIN_PROPOSALS = 50
+
+
+@lru_cache(maxsize=4096)
+def company_name_shingles(name: str) -> frozenset:
+    """Return the set of character 3-grams of a normalized company name (spaces dropped).
+    
+    Cached: duplicate proposals (the ones dedup exists for) repeat the same names.
+    """
+    compact = normalize_company_name(name).replace(' ', '')
+    if len(compact) <= 3:
+        return frozenset((compact,)) if compact else frozenset()
+    return frozenset(compact[k:k + 3] for k in range(len(compact) - 2))
+
+
+def jaccard_similarity(shingles1: frozenset, shingles2: frozenset) -> float:
+    """Jaccard similarity of two shingle sets (0-1)."""
+    if not shingles1 or not shingles2:
+        return 0.0
+    if shingles1 == shingles2:
+        return 1.0
+    # |A | B| = |A| + |B| - |A & B|, so the union set never has to be built
+    intersection = len(shingles1 & shingles2)
+    return intersection / (len(shingles1) + len(shingles2) - intersection)
 
 
 def calculate_similarity(name1: str, name2: str) -> float:
     """Calculate similarity between two company names (0-1)."""
-    norm1 = normalize_company_name(name1)
-    norm2 = normalize_company_name(name2)
-    if not norm1 or not norm2:
-        return 0.0
-    return SequenceMatcher(None, norm1, norm2).ratio()
+    return jaccard_similarity(company_name_shingles(name1), company_name_shingles(name2))
+
+
+def _build_index_candidates(shingle_sets: List[frozenset]) -> List[List[int]]:
+    """
+    For each name, list the indices of later names whose Jaccard similarity reaches the threshold.
+    
+    Exact: intersection sizes are counted through an inverted shingle index, so pairs
+    that share no shingle are never visited and no per-pair set is built.
+    """
+    postings = defaultdict(list)  # shingle -> indices of names containing it
+    candidates = [[] for _ in shingle_sets]
+    for idx, shingles in enumerate(shingle_sets):
+        overlap = Counter()
+        for shingle in shingles:
+            overlap.update(postings[shingle])
+            postings[shingle].append(idx)
+        size = len(shingles)
+        for other, common in overlap.items():
+            if common / (size + len(shingle_sets[other]) - common) >= SIMILARITY_THRESHOLD:
+                candidates[other].append(idx)
+    return candidates
 
 
 def count_complete_fields(proposal: Dict[str, Any]) -> int:
@@ -82,7 +150,10 @@ def deduplicate_proposals(proposals: List[Dict[str, Any]]) -> Tuple[List[Dict[st
     """
     Deduplicate proposals by company name using fuzzy matching.
     
-    Uses SequenceMatcher to find similar company names (threshold: 0.85 similarity).
+    Compares character 3-gram shingles of the normalized company names with
+    Jaccard similarity (threshold: SIMILARITY_THRESHOLD). Shingles are built once
+    per proposal; for large batches an exact inverted shingle index finds the
+    matching pairs without comparing every pair.
     When duplicates are found, keeps the proposal with the most complete data
     (most non-null fields). Merged proposals include source_files array and _merged flag.
     
@@ -102,6 +173,12 @@ def deduplicate_proposals(proposals: List[Dict[str, Any]]) -> Tuple[List[Dict[st
     if len(valid_proposals) <= 1:
         return proposals, 0
     
+    # Shingle each company name once, up front
+    shingle_sets = [company_name_shingles(p['company_name']['value']) for p in valid_proposals]
+    index_matches = None
+    if len(valid_proposals) > INDEX_MIN_PROPOSALS:
+        index_matches = _build_index_candidates(shingle_sets)
+    
     deduplicated = []
     processed_indices = set()
     merge_count = 0
@@ -120,17 +197,33 @@ def deduplicate_proposals(proposals: List[Dict[str, Any]]) -> Tuple[List[Dict[st
         duplicates = [i]
         source_files = [proposal.get('source_file', '')]
         
-        for j in range(i + 1, len(valid_proposals)):
+        # Everything about name i is looked up once here rather than per pair;
+        # a name with no shingles (all punctuation) can't match anything
+        shingles = shingle_sets[i]
+        size = len(shingles)
+        if not size:
+            candidates = ()
+        elif index_matches is not None:
+            candidates = index_matches[i]
+        else:
+            candidates = range(i + 1, len(valid_proposals))
+        for j in candidates:
             if j in processed_indices:
                 continue
+            if index_matches is not None:
+                # The index only returns pairs that already meet the threshold
+                duplicates.append(j)
+                source_files.append(valid_proposals[j].get('source_file', ''))
+                continue
             
-            other_company = valid_proposals[j].get('company_name', {}).get('value', '')
-            if not other_company:
+            # Jaccard can't exceed min/max of the set sizes - skip pairs that can't reach the threshold
+            other = shingle_sets[j]
+            other_size = len(other)
+            if min(size, other_size) < SIMILARITY_THRESHOLD * max(size, other_size):
                 continue
             
-            similarity = calculate_similarity(company_name, other_company)
-            # Threshold of 0.85 for fuzzy matching
-            if similarity >= 0.85:
+            similarity = jaccard_similarity(shingles, other)
+            if similarity >= SIMILARITY_THRESHOLD:
                 duplicates.append(j)
                 source_files.append(valid_proposals[j].get('source_file', ''))
         
@@ -162,118 +255,155 @@ def deduplicate_proposals(proposals: List[Dict[str, Any]]) -> Tuple[List[Dict[st
     return deduplicated + invalid_proposals, merge_count
 
 
+async def save_upload_to_temp(file: UploadFile) -> str:
+    """Save an uploaded PDF to a temporary file in UPLOADS_DIR and return its path."""
+    with tempfile.NamedTemporaryFile(
+        delete=False,
+        suffix='.pdf',
+        dir=UPLOADS_DIR
+    ) as temp_file:
+        # Copy in chunks so a large upload never sits in memory as one bytes object.
+        # Each chunk is written in a worker thread while the next one is read, so disk
+        # writes overlap with reads and never block the event loop.
+        write = None
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                if write is not None:
+                    await write
+                write = asyncio.ensure_future(asyncio.to_thread(temp_file.write, chunk))
+        finally:
+            if write is not None:
+                await write
+        return temp_file.name
+
+
+async def _process_one(file: UploadFile) -> Union[Tuple[str, str], Dict[str, Any]]:
+    """
+    Save one uploaded PDF and extract its text.
+    
+    Returns:
+        (extracted_text, extraction_method) on success, or an error proposal dict
+    """
+    # Create temporary file
+    temp_file_path = None
+    try:
+        # Save uploaded file temporarily
+        temp_file_path = await save_upload_to_temp(file)
+        
+        # Extract text from PDF (pdfplumber/Tesseract block, so run off the event loop)
+        return await asyncio.to_thread(extract_text_from_pdf, temp_file_path)
+        
+    except FileNotFoundError as e:
+        # User-friendly error for missing files
+        return {
+            "source_file": file.filename,
+            "extraction_method": "error",
+            "company_name": {"value": None, "confidence": "none"},
+            "contact_name": {"value": None, "confidence": "none"},
+            "email": {"value": None, "confidence": "none"},
+            "phone": {"value": None, "confidence": "none"},
+            "trade": {"value": None, "confidence": "none"},
+            "error": f"File not found: {file.filename}"
+        }
+    except Exception as e:
+        # User-friendly error messages
+        error_message = str(e)
+        if "OCR" in error_message or "tesseract" in error_message.lower():
+            error_message = f"Failed to process scanned PDF. Please ensure the PDF is readable."
+        elif "OpenAI" in error_message or "API" in error_message:
+            error_message = f"Failed to extract data. Please check your API key and try again."
+        elif "PDF" in error_message:
+            error_message = f"Invalid or corrupted PDF file."
+        else:
+            error_message = f"Processing failed: {error_message}"
+        
+        return {
+            "source_file": file.filename,
+            "extraction_method": "error",
+            "company_name": {"value": None, "confidence": "none"},
+            "contact_name": {"value": None, "confidence": "none"},
+            "email": {"value": None, "confidence": "none"},
+            "phone": {"value": None, "confidence": "none"},
+            "trade": {"value": None, "confidence": "none"},
+            "error": error_message
+        }
+    
+    finally:
+        # Clean up temporary file
+        # Always remove temp files to prevent disk space issues
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+            except Exception:
+                # Silently fail on cleanup - not critical for user experience
+                pass
+
+
+async def _with_pdf_slot(func, *args):
+    """Await func(*args) while holding one of the PDF_PROCESSING_CONCURRENCY processing slots."""
+    async with app.state.pdf_slots:
+        return await func(*args)
+
+
 @app.post("/upload")
 async def upload_pdfs(files: List[UploadFile] = File(...)):
     """
     Upload and process multiple PDF files.
     
-    Extracts text from each PDF, then uses OpenAI to extract structured contact information.
+    Extracts text from each PDF, then uses OpenAI to extract structured contact information
+    (several PDFs per OpenAI request).
     Returns a list of proposals with extracted data, source file, and extraction method.
     """
     proposals = []
+    pending = []  # (index in proposals, filename, extracted_text, extraction_method)
+    
+    # Save and extract PDFs concurrently (bounded by PDF_PROCESSING_CONCURRENCY);
+    # results come back in upload order
+    pdf_files = [file for file in files if file.filename.endswith('.pdf')]
+    outcomes = await asyncio.gather(*(_with_pdf_slot(_process_one, file) for file in pdf_files))
     
-    for file in files:
-        # Validate file type
-        if not file.filename.endswith('.pdf'):
+    for file, outcome in zip(pdf_files, outcomes):
+        if isinstance(outcome, dict):
+            proposals.append(outcome)
             continue
         
-        # Create temporary file
-        temp_file_path = None
-        try:
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix='.pdf',
-                dir=UPLOADS_DIR
-            ) as temp_file:
-                content = await file.read()
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-            
-            # Extract text from PDF
-            extracted_text, extraction_method = extract_text_from_pdf(temp_file_path)
-            
-            # Extract contact info using OpenAI (pass extraction method for OCR-specific handling)
-            try:
-                contact_info = extract_contact_info(extracted_text, file.filename, extraction_method)
-                print(f"INFO: Extraction completed for {file.filename}, contact_info keys: {contact_info.keys() if isinstance(contact_info, dict) else 'Not a dict'}")
-            except Exception as e:
-                print(f"ERROR: extract_contact_info failed for {file.filename}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                contact_info = {
-                    "company_name": {"value": None, "confidence": "none"},
-                    "contact_name": {"value": None, "confidence": "none"},
-                    "email": {"value": None, "confidence": "none"},
-                    "phone": {"value": None, "confidence": "none"},
-                    "website": {"value": None, "confidence": "none"},
-                    "trade": {"value": None, "confidence": "none"},
-                }
-            
-            # Build proposal result
-            if not isinstance(contact_info, dict):
-                print(f"ERROR: contact_info is not a dict for {file.filename}, type: {type(contact_info)}")
-                contact_info = {
-                    "company_name": {"value": None, "confidence": "none"},
-                    "contact_name": {"value": None, "confidence": "none"},
-                    "email": {"value": None, "confidence": "none"},
-                    "phone": {"value": None, "confidence": "none"},
-                    "website": {"value": None, "confidence": "none"},
-                    "trade": {"value": None, "confidence": "none"},
-                }
-            
-            proposal = {
-                "source_file": file.filename,
-                "extraction_method": extraction_method,
-                **contact_info
-            }
-            
-            proposals.append(proposal)
-            
-        except FileNotFoundError as e:
-            # User-friendly error for missing files
-            proposals.append({
-                "source_file": file.filename,
-                "extraction_method": "error",
-                "company_name": {"value": None, "confidence": "none"},
-                "contact_name": {"value": None, "confidence": "none"},
-                "email": {"value": None, "confidence": "none"},
-                "phone": {"value": None, "confidence": "none"},
-                "trade": {"value": None, "confidence": "none"},
-                "error": f"File not found: {file.filename}"
-            })
-        except Exception as e:
-            # User-friendly error messages
-            error_message = str(e)
-            if "OCR" in error_message or "tesseract" in error_message.lower():
-                error_message = f"Failed to process scanned PDF. Please ensure the PDF is readable."
-            elif "OpenAI" in error_message or "API" in error_message:
-                error_message = f"Failed to extract data. Please check your API key and try again."
-            elif "PDF" in error_message:
-                error_message = f"Invalid or corrupted PDF file."
-            else:
-                error_message = f"Processing failed: {error_message}"
-            
-            proposals.append({
-                "source_file": file.filename,
-                "extraction_method": "error",
+        # Contact extraction is batched across files below; keep this file's slot
+        extracted_text, extraction_method = outcome
+        pending.append((len(proposals), file.filename, extracted_text, extraction_method))
+        proposals.append(None)
+    
+    # Extract contact info using OpenAI, packing several PDFs into each request
+    # (extraction method is passed through for OCR-specific handling)
+    try:
+        contact_infos = await extract_contact_info_batch_async(
+            [(extracted_text, filename, extraction_method) for _, filename, extracted_text, extraction_method in pending]
+        )
+    except Exception as e:
+        print(f"ERROR: extract_contact_info_batch_async failed for {len(pending)} file(s): {str(e)}")
+        import traceback
+        traceback.print_exc()
+        contact_infos = [None] * len(pending)
+    
+    for (index, filename, _, extraction_method), contact_info in zip(pending, contact_infos):
+        # Build proposal result
+        if not isinstance(contact_info, dict):
+            print(f"ERROR: contact_info is not a dict for {filename}, type: {type(contact_info)}")
+            contact_info = {
                 "company_name": {"value": None, "confidence": "none"},
                 "contact_name": {"value": None, "confidence": "none"},
                 "email": {"value": None, "confidence": "none"},
                 "phone": {"value": None, "confidence": "none"},
+                "website": {"value": None, "confidence": "none"},
                 "trade": {"value": None, "confidence": "none"},
-                "error": error_message
-            })
+            }
+        else:
+            print(f"INFO: Extraction completed for {filename}, contact_info keys: {contact_info.keys()}")
         
-        finally:
-            # Clean up temporary file
-            # Always remove temp files to prevent disk space issues
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.remove(temp_file_path)
-                except Exception:
-                    # Silently fail on cleanup - not critical for user experience
-                    pass
+        proposals[index] = {
+            "source_file": filename,
+            "extraction_method": extraction_method,
+            **contact_info
+        }
     
     # Deduplicate proposals by company name
     deduplicated_proposals, merge_count = deduplicate_proposals(proposals)
@@ -285,6 +415,48 @@ async def upload_pdfs(files: List[UploadFile] = File(...)):
     }
 
 
+@app.post("/upload/stream")
+async def upload_pdf_stream(file: UploadFile = File(...)):
+    """
+    Upload and process a single PDF, streaming progress as newline-delimited JSON.
+    
+    Emits {"type": "reasoning", "delta": "..."} events while GPT-4o is still writing its
+    analysis, then {"type": "proposal", "proposal": {...}} with the same proposal shape
+    as /upload, so the UI can show progress long before the full response arrives.
+    """
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported.")
+    
+    temp_file_path = None
+    try:
+        temp_file_path = await save_upload_to_temp(file)
+        extracted_text, extraction_method = await _with_pdf_slot(asyncio.to_thread, extract_text_from_pdf, temp_file_path)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Processing failed: {str(e)}")
+    finally:
+        # Text is extracted up front, so the temp file is not needed while streaming
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+            except Exception:
+                pass
+    
+    async def events():
+        async for event in stream_contact_info(extracted_text, file.filename, extraction_method):
+            if event["type"] == "result":
+                event = {
+                    "type": "proposal",
+                    "proposal": {
+                        "source_file": file.filename,
+                        "extraction_method": extraction_method,
+                        **event["data"]
+                    }
+                }
+            yield json.dumps(event) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @app.post("/confirm")
 async def confirm_proposals(proposals: List[dict]):
     """
@@ -1,10 +1,188 @@
 import pdfplumber
+from pdfplumber.utils import extract_text
 from pdf2image import convert_from_path
 import pytesseract
-from typing import Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from PIL import Image
 import os
 import re
-import sys
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from debug_log import get_logger
+
+# Per-page OCR tracing is opt-in (BIDBOOK_DEBUG_EXTRACT=1) and shares extractor's debug log file
+logger = get_logger(__name__)
+
+# Optional: persistent in-process Tesseract (pip install tesserocr). Without it every
+# OCR call goes through pytesseract, which spawns the tesseract binary and reloads the model.
+try:
+    from tesserocr import PyTessBaseAPI, PSM, RIL, iterate_level
+except ImportError:
+    PyTessBaseAPI = None
+
+# One tesserocr API per _OCR_EXECUTOR thread (see _run_on_ocr_pool), all ended at exit
+_tess_local = threading.local()
+_tess_apis = []
+_tess_apis_lock = threading.Lock()
+
+# "Contact: Nathaniel" -> "Contact Name: Nathaniel" (see _preprocess_contact_text)
+_CONTACT_RE = re.compile(r'Contact:\s*([A-Za-z]+(?:\s+[A-Za-z]+)*)', re.IGNORECASE)
+
+# Contact info patterns in OCR'd footers: web, email, phone words/punctuation, common area codes
+_FOOTER_PAT = re.compile(r'www|\.com|\.net|\.org|@|Fax|Phone|Tel|703|301|907|\(|\)|-')
+
+# Scanned-PDF pages are OCR'd concurrently on this long-lived pool (shared by all uploads, so it
+# also caps total OCR concurrency; its threads keep their tesserocr APIs between PDFs)
+OCR_PAGE_WORKERS = int(os.getenv("OCR_PAGE_WORKERS", "4"))
+
+
+def _mark_ocr_thread() -> None:
+    """Initializer for _OCR_EXECUTOR threads, so _run_on_ocr_pool can tell it is already on one."""
+    _tess_local.on_pool = True
+
+
+_OCR_EXECUTOR = ThreadPoolExecutor(max_workers=OCR_PAGE_WORKERS, thread_name_prefix="ocr", initializer=_mark_ocr_thread)
+
+# Footer OCR below this mean word confidence (0-100) is redone at 300 DPI if it looks like contact info
+FOOTER_OCR_MIN_CONFIDENCE = float(os.getenv("FOOTER_OCR_MIN_CONFIDENCE", "70"))
+
+
+def _run_on_ocr_pool(fn: Callable[..., Any], *args) -> Any:
+    """
+    Call fn(*args) on an _OCR_EXECUTOR thread and return its result.
+    
+    Scanned pages already run on the pool and call through inline. Everything else
+    (header and footer OCR from asyncio.to_thread workers) is handed to the pool, so
+    tesserocr engines are only ever loaded by its OCR_PAGE_WORKERS threads.
+    """
+    if getattr(_tess_local, "on_pool", False):
+        return fn(*args)
+    return _OCR_EXECUTOR.submit(fn, *args).result()
+
+
+def _end_tess_apis() -> None:
+    """Stop the OCR pool and free every tesserocr engine its threads loaded (runs at exit)."""
+    _OCR_EXECUTOR.shutdown(wait=True)
+    with _tess_apis_lock:
+        for api in _tess_apis:
+            api.End()
+        _tess_apis.clear()
+
+
+if PyTessBaseAPI is not None:
+    atexit.register(_end_tess_apis)
+
+
+def _get_tess_api(image: Image.Image, box: Optional[Tuple[int, int, int, int]]):
+    """
+    Return this thread's tesserocr API, loaded with image (restricted to box if given).
+    
+    Only call on an _OCR_EXECUTOR thread (via _run_on_ocr_pool).
+    """
+    api = getattr(_tess_local, "api", None)
+    if api is None:
+        api = _tess_local.api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK)
+        with _tess_apis_lock:
+            _tess_apis.append(api)
+    api.SetImage(image)
+    if box:
+        left, top, right, bottom = box
+        api.SetRectangle(left, top, right - left, bottom - top)
+    return api
+
+
+def _ocr_image(image: Image.Image, box: Optional[Tuple[int, int, int, int]] = None) -> str:
+    """
+    OCR an image, or the (left, top, right, bottom) box within it.
+    
+    Uses PSM 6 (Assume a single uniform block of text), which helps with footer
+    margins that get cropped in default modes. With tesserocr the box is applied via
+    SetRectangle on a long-lived API, so no crop or subprocess is needed.
+    """
+    if PyTessBaseAPI is not None:
+        return _run_on_ocr_pool(lambda: _get_tess_api(image, box).GetUTF8Text())
+    
+    region = image.crop(box) if box else image
+    return pytesseract.image_to_string(region, config=r'--psm 6')
+
+
+def _ocr_data_lines(image: Image.Image) -> Tuple[List[List[Tuple[str, int]]], float]:
+    """
+    Run pytesseract's image_to_data once and group the recognized words into lines.
+    
+    Returns:
+        Tuple of (lines in reading order, each a list of (word, top) pairs,
+        mean word confidence 0-100)
+    """
+    data = pytesseract.image_to_data(image, config=r'--psm 6', output_type=pytesseract.Output.DICT)
+    lines = {}
+    confidences = []
+    for word, conf, top, block_num, par_num, line_num in zip(data["text"], data["conf"], data["top"], data["block_num"], data["par_num"], data["line_num"]):
+        if float(conf) < 0 or not word.strip():
+            continue
+        confidences.append(float(conf))
+        lines.setdefault((block_num, par_num, line_num), []).append((word, top))
+    return list(lines.values()), (sum(confidences) / len(confidences) if confidences else 0.0)
+
+
+def _join_lines(lines: Iterable[List[str]]) -> str:
+    """Join lines of words back into text, one line per row (empty lines dropped)."""
+    return "\n".join(" ".join(words) for words in lines if words)
+
+
+def _ocr_image_with_confidence(image: Image.Image, box: Optional[Tuple[int, int, int, int]] = None) -> Tuple[str, float]:
+    """
+    Like _ocr_image, but also return Tesseract's mean word confidence (0-100).
+    
+    Without tesserocr this is a single image_to_data call (see _ocr_data_lines).
+    """
+    if PyTessBaseAPI is not None:
+        return _run_on_ocr_pool(_tess_text_with_confidence, image, box)
+    
+    lines, confidence = _ocr_data_lines(image.crop(box) if box else image)
+    return _join_lines([word for word, _ in line] for line in lines), confidence
+
+
+def _ocr_page_and_footer(image: Image.Image, footer_top: int) -> Tuple[str, str]:
+    """
+    OCR a full page once and split out its footer: the words whose top edge is at or below footer_top.
+    
+    The footer strip is part of the page, so one Tesseract pass yields both texts
+    instead of a full-page pass plus a second pass over the footer crop.
+    
+    Returns:
+        Tuple of (full page text, footer text)
+    """
+    if PyTessBaseAPI is not None:
+        return _run_on_ocr_pool(_tess_page_and_footer, image, footer_top)
+    
+    lines, _ = _ocr_data_lines(image)
+    page_text = _join_lines([word for word, _ in line] for line in lines)
+    footer_text = _join_lines([word for word, top in line if top >= footer_top] for line in lines)
+    return page_text, footer_text
+
+
+def _tess_text_with_confidence(image: Image.Image, box: Optional[Tuple[int, int, int, int]]) -> Tuple[str, float]:
+    """tesserocr body of _ocr_image_with_confidence (runs on _OCR_EXECUTOR)."""
+    api = _get_tess_api(image, box)
+    return api.GetUTF8Text(), float(api.MeanTextConf())
+
+
+def _tess_page_and_footer(image: Image.Image, footer_top: int) -> Tuple[str, str]:
+    """tesserocr body of _ocr_page_and_footer (runs on _OCR_EXECUTOR)."""
+    api = _get_tess_api(image, None)
+    api.Recognize()
+    page_text = api.GetUTF8Text()
+    footer_lines = []
+    for word in iterate_level(api.GetIterator(), RIL.WORD):
+        if word.IsAtBeginningOf(RIL.TEXTLINE) or not footer_lines:
+            footer_lines.append([])
+        text = word.GetUTF8Text(RIL.WORD)
+        if text and text.strip() and word.BoundingBox(RIL.WORD)[1] >= footer_top:
+            footer_lines[-1].append(text)
+    return page_text, _join_lines(footer_lines)
 
 
 def extract_text_from_pdf(pdf_path: str) -> Tuple[str, str]:
@@ -34,96 +212,130 @@ def extract_text_from_pdf(pdf_path: str) -> Tuple[str, str]:
         all_footer_text = ""
         filename = os.path.basename(pdf_path)
         
+        # Pass 1: pdfplumber text for every page, noting which footers need OCR
+        page_texts = []
+        footer_texts = []
+        footer_ocr_pages = set()
         with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
             for page_num, page in enumerate(pdf.pages):
-                # Extract standard page text
-                page_text = page.extract_text() or ""
+                # Parse the page's characters once; page and footer text are both built from them
+                chars = page.chars
                 
-                # HEADER RECOVERY (Page 1 Only) - Critical for United & R. Lee
-                ocr_header_text = ""
-                if page_num == 0:
-                    try:
-                        # Re-use the existing pdf2image logic for headers
-                        header_images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300)
-                        if header_images:
-                            header_img = header_images[0]
-                            img_width, img_height = header_img.size
-                            # Crop the Top 20% for header region
-                            header_region = header_img.crop((0, 0, img_width, int(img_height * 0.20)))
-                            ocr_header_text = pytesseract.image_to_string(header_region, config='--psm 6')
-                            if len(ocr_header_text.strip()) > 5:
-                                ocr_header_text = f"\n[HEADER_SCAN]:\n{ocr_header_text.strip()}\n"
-                                print(f"DEBUG: OCR'd Header Text (Page 1, High-Res 300 DPI): {ocr_header_text.strip()}")
-                                sys.stdout.flush()
-                    except Exception as e:
-                        print(f"DEBUG: Header OCR failed for page 1: {e}")
-                        sys.stdout.flush()
-                
-                # Prepend header, Append page text
-                if ocr_header_text:
-                    text += ocr_header_text
-                if page_text:
-                    text += f"--- PAGE {page_num+1} ---\n{page_text}\n"
+                # Extract standard page text
+                page_text = extract_text(chars) or ""
                 
                 # Force footer extraction: Extract bottom 8% of EVERY page (tightened to avoid table rows)
                 page_height = page.height
                 footer_bbox = (0, page_height * 0.92, page.width, page_height)
-                footer_text = page.within_bbox(footer_bbox).extract_text()
+                footer_chars = _chars_within_bbox(chars, footer_bbox)
+                footer_text = extract_text(footer_chars)
                 
-                # Hybrid Footer OCR: High-Res Surgical Crop (only if pdfplumber found no footer text)
-                # Only run on first or last page (where contact info usually lives) or if page text is short
-                if (not footer_text or len(footer_text.strip()) < 10) and (page_num == 0 or page_num == len(pdf.pages) - 1 or len(page_text or "") < 500):
-                    try:
-                        # Convert page to High-Res Image (300 DPI is critical for small footer text)
-                        page_images = convert_from_path(pdf_path, first_page=page_num + 1, last_page=page_num + 1, dpi=300)
-                        if page_images:
-                            page_image = page_images[0]
-                            
-                            # SURGICAL CROP: Only the bottom 8% (0.92) to avoid capturing bid table rows
-                            # Previous 15% (0.85) was catching table data like "Copper Water Service"
-                            img_width, img_height = page_image.size
-                            footer_top = int(img_height * 0.92)
-                            footer_region = page_image.crop((0, footer_top, img_width, img_height))
-                            
-                            # Run OCR on footer region with PSM 6 (block of text)
-                            ocr_footer_text = pytesseract.image_to_string(footer_region, config=r'--psm 6')
-                            
-                            # Filter noise: Only keep if it looks like contact info (digits, @, www, phone patterns)
-                            if ocr_footer_text and ocr_footer_text.strip():
-                                # Check if it contains contact info patterns
-                                contact_patterns = ['www', '.com', '.net', '.org', '@', 'Fax', 'Phone', 'Tel', 
-                                                   '703', '301', '907', '(', ')', '-']  # Common area codes and phone patterns
-                                has_contact_info = any(pattern in ocr_footer_text for pattern in contact_patterns)
-                                
-                                if has_contact_info:
-                                    footer_text = ocr_footer_text.strip()
-                                    print(f"DEBUG: OCR'd Footer Text (Page {page_num + 1}, High-Res 300 DPI): {footer_text}")
-                                    sys.stdout.flush()
-                                else:
-                                    # Filtered out as noise
-                                    print(f"DEBUG: Footer OCR filtered out noise (Page {page_num + 1}): {ocr_footer_text.strip()[:50]}...")
-                                    sys.stdout.flush()
-                    except Exception as e:
-                        # If OCR fails, continue with empty footer_text
-                        print(f"DEBUG: Footer OCR failed for page {page_num + 1}: {e}")
-                        sys.stdout.flush()
+                # Hybrid Footer OCR: only on the first or last page (where contact info usually lives),
+                # only if pdfplumber sees no character boxes in the footer at all (a short footer such as
+                # a page number is real text, not a scan), and only if the footer holds images/vector
+                # graphics that could be rasterized text, e.g. a scanned letterhead strip.
+                # Cheapest checks first.
+                if page_num in (0, page_count - 1) and not footer_chars and _has_graphics_in_bbox(page, footer_bbox):
+                    footer_ocr_pages.add(page_num)
                 
-                if footer_text and footer_text.strip():
-                    # Add footer text with specific high-value tags
-                    footer_tagged = f"\n--- [FOOTER DATA START] ---\n{footer_text.strip()}\n--- [FOOTER DATA END] ---\n"
-                    text += footer_tagged
-                    all_footer_text += f"Page {page_num + 1} Footer: {footer_text.strip()}\n"
-        
-        # Debug logging for footer data (always print, even if empty)
-        print(f"\n{'='*80}")
-        print(f"DEBUG: Footer Extraction for {filename}")
-        print(f"{'='*80}")
-        if all_footer_text:
-            print(f"FOOTER DATA FOUND:\n{all_footer_text}")
-        else:
-            print("NO FOOTER DATA FOUND - Footer region was empty")
-        print(f"{'='*80}\n")
-        sys.stdout.flush()  # Force flush to ensure output appears immediately
+                page_texts.append(page_text)
+                footer_texts.append(footer_text)
+        
+        # Render page 1 once at 300 DPI for the header scan (logos/letterheads need high resolution)
+        header_images = {}
+        if page_count:
+            try:
+                header_images = _render_pages(pdf_path, [1], dpi=300)
+            except Exception as e:
+                logger.debug("Header OCR failed for page 1: %s", e)
+        
+        # Footer OCR: reuse the 300 DPI page 1 image downscaled to ~150 DPI; render other pages at
+        # 200 DPI. Footers that look like contact info but were read with low confidence are redone
+        # at full 300 DPI (page 1 from the image already in hand, others re-rendered).
+        footer_ocr = {}  # page_num -> (ocr_footer_text, dpi, has_contact_info)
+        footer_images = {}
+        try:
+            footer_images = _render_pages(pdf_path, [page_num + 1 for page_num in footer_ocr_pages if page_num != 0], dpi=200)
+        except Exception as e:
+            logger.debug("Footer page rendering failed for %s: %s", filename, e)
+        if 0 in footer_ocr_pages and 1 in header_images:
+            footer_images[1] = header_images[1]
+        
+        retry_pages = []
+        for page_num in sorted(footer_ocr_pages):
+            if page_num + 1 not in footer_images:
+                continue
+            try:
+                dpi = 150 if page_num == 0 else 200
+                ocr_footer_text, confidence = _ocr_footer(footer_images.pop(page_num + 1), downscale=page_num == 0)
+                has_contact_info = _looks_like_contact_info(ocr_footer_text)
+                footer_ocr[page_num] = (ocr_footer_text, dpi, has_contact_info)
+                if confidence < FOOTER_OCR_MIN_CONFIDENCE and has_contact_info:
+                    retry_pages.append(page_num)
+            except Exception as e:
+                # If OCR fails, continue with empty footer_text
+                logger.debug("Footer OCR failed for page %d: %s", page_num + 1, e)
+        
+        if retry_pages:
+            try:
+                retry_images = _render_pages(pdf_path, [page_num + 1 for page_num in retry_pages if page_num != 0], dpi=300)
+                if 0 in retry_pages:
+                    retry_images[1] = header_images[1]
+                for page_number, page_image in retry_images.items():
+                    ocr_footer_text = _ocr_footer(page_image)[0]
+                    footer_ocr[page_number - 1] = (ocr_footer_text, 300, _looks_like_contact_info(ocr_footer_text))
+            except Exception as e:
+                # Keep the lower-resolution result
+                logger.debug("High-Res footer OCR retry failed for %s: %s", filename, e)
+        
+        # Pass 2: assemble text in page order
+        for page_num, (page_text, footer_text) in enumerate(zip(page_texts, footer_texts)):
+            # HEADER RECOVERY (Page 1 Only) - Critical for United & R. Lee
+            ocr_header_text = ""
+            if page_num == 0 and 1 in header_images:
+                try:
+                    header_img = header_images[1]
+                    img_width, img_height = header_img.size
+                    # OCR the Top 20% for header region
+                    ocr_header_text = _ocr_image(header_img, (0, 0, img_width, int(img_height * 0.20)))
+                    if len(ocr_header_text.strip()) > 5:
+                        ocr_header_text = f"\n[HEADER_SCAN]:\n{ocr_header_text.strip()}\n"
+                        logger.debug("OCR'd Header Text (Page 1, High-Res 300 DPI): %s", ocr_header_text.strip())
+                except Exception as e:
+                    logger.debug("Header OCR failed for page 1: %s", e)
+            
+            # Prepend header, Append page text
+            if ocr_header_text:
+                text += ocr_header_text
+            if page_text:
+                text += f"--- PAGE {page_num+1} ---\n{page_text}\n"
+            
+            if page_num in footer_ocr:
+                ocr_footer_text, dpi, has_contact_info = footer_ocr[page_num]
+                
+                # Filter noise: Only keep if it looks like contact info (digits, @, www, phone patterns)
+                if ocr_footer_text and ocr_footer_text.strip():
+                    if has_contact_info:
+                        footer_text = ocr_footer_text.strip()
+                        logger.debug("OCR'd Footer Text (Page %d, %d DPI): %s", page_num + 1, dpi, footer_text)
+                    else:
+                        # Filtered out as noise
+                        logger.debug("Footer OCR filtered out noise (Page %d): %.50s...", page_num + 1, ocr_footer_text.strip())
+            
+            if footer_text and footer_text.strip():
+                # Add footer text with specific high-value tags
+                footer_tagged = f"\n--- [FOOTER DATA START] ---\n{footer_text.strip()}\n--- [FOOTER DATA END] ---\n"
+                text += footer_tagged
+                all_footer_text += f"Page {page_num + 1} Footer: {footer_text.strip()}\n"
+        
+        # Debug logging for footer data (logged even if empty)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Footer Extraction for %s\n%s",
+                filename,
+                f"FOOTER DATA FOUND:\n{all_footer_text}" if all_footer_text else "NO FOOTER DATA FOUND - Footer region was empty",
+            )
         
         # Apply regex pre-processing for contact extraction (Tel Set fix)
         text = _preprocess_contact_text(text)
@@ -139,70 +351,39 @@ def extract_text_from_pdf(pdf_path: str) -> Tuple[str, str]:
     
     # Fall back to OCR for scanned PDFs
     try:
-        # Convert PDF pages to images
-        images = convert_from_path(pdf_path)
-        
-        # OCR config: Use PSM 6 (Assume a single uniform block of text)
-        # This helps with footer margins that get cropped in default modes
-        custom_config = r'--psm 6'
+        # Convert PDF pages to images. Page 1 is rendered at 300 DPI (the header scan needs
+        # high resolution for logos/letterheads) and reused for its full-page and footer OCR;
+        # the remaining pages use the default DPI.
+        images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300)
+        images += convert_from_path(pdf_path, first_page=2)
         
         # Extract text from each page using OCR
         ocr_text = ""
         all_footer_text = ""
         filename = os.path.basename(pdf_path)
         
-        for page_num, image in enumerate(images):
-            # HEADER RECOVERY (Page 1 Only) - Critical for United & R. Lee
-            # For OCR path, we need high-res scan (300 DPI) for logos/letterheads
-            ocr_header_text = ""
-            if page_num == 0:
-                try:
-                    # Convert Page 1 separately at 300 DPI for header scan (logos need high resolution)
-                    header_images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300)
-                    if header_images:
-                        header_img = header_images[0]
-                        img_width, img_height = header_img.size
-                        # Crop the Top 20% for header region
-                        header_region = header_img.crop((0, 0, img_width, int(img_height * 0.20)))
-                        ocr_header_text = pytesseract.image_to_string(header_region, config=r'--psm 6')
-                        if len(ocr_header_text.strip()) > 5:
-                            ocr_header_text = f"\n[HEADER_SCAN]:\n{ocr_header_text.strip()}\n"
-                            print(f"DEBUG: OCR'd Header Text (OCR Path, Page 1, High-Res 300 DPI): {ocr_header_text.strip()}")
-                            sys.stdout.flush()
-                except Exception as e:
-                    print(f"DEBUG: Header OCR failed (OCR path) for page 1: {e}")
-                    sys.stdout.flush()
-            
+        # OCR pages in parallel (Tesseract runs outside the GIL); map keeps page order
+        page_results = _OCR_EXECUTOR.map(_ocr_scanned_page, range(len(images)), images)
+        for page_num, (ocr_header_text, page_text, footer_text) in enumerate(page_results):
             # Prepend header if present
             if ocr_header_text:
                 ocr_text += ocr_header_text
             
-            # Extract full page text - ENSURE we pass the *entire* image height to OCR
-            page_text = pytesseract.image_to_string(image, config=custom_config)
             ocr_text += f"--- PAGE {page_num+1} ---\n{page_text}\n"
             
-            # Force footer extraction: Extract bottom 15% of image explicitly
-            img_width, img_height = image.size
-            footer_top = int(img_height * 0.92)
-            footer_region = image.crop((0, footer_top, img_width, img_height))
-            footer_text = pytesseract.image_to_string(footer_region, config=custom_config)
-            
             if footer_text and footer_text.strip():
                 # Add footer text with specific high-value tags
                 footer_tagged = f"\n--- [FOOTER DATA START] ---\n{footer_text.strip()}\n--- [FOOTER DATA END] ---\n"
                 ocr_text += footer_tagged
                 all_footer_text += f"Page {page_num + 1} Footer: {footer_text.strip()}\n"
         
-        # Debug logging for footer data (always print, even if empty)
-        print(f"\n{'='*80}")
-        print(f"DEBUG: Footer Extraction (OCR) for {filename}")
-        print(f"{'='*80}")
-        if all_footer_text:
-            print(f"FOOTER DATA FOUND:\n{all_footer_text}")
-        else:
-            print("NO FOOTER DATA FOUND - Footer region was empty")
-        print(f"{'='*80}\n")
-        sys.stdout.flush()  # Force flush to ensure output appears immediately
+        # Debug logging for footer data (logged even if empty)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Footer Extraction (OCR) for %s\n%s",
+                filename,
+                f"FOOTER DATA FOUND:\n{all_footer_text}" if all_footer_text else "NO FOOTER DATA FOUND - Footer region was empty",
+            )
         
         # Apply regex pre-processing for contact extraction (Tel Set fix)
         ocr_text = _preprocess_contact_text(ocr_text)
@@ -213,6 +394,114 @@ def extract_text_from_pdf(pdf_path: str) -> Tuple[str, str]:
         raise Exception(f"Failed to process PDF with OCR: {e}")
 
 
+def _ocr_scanned_page(page_num: int, image: Image.Image) -> Tuple[str, str, str]:
+    """
+    OCR one rendered page of a scanned PDF (runs on _OCR_EXECUTOR).
+    
+    Returns:
+        Tuple of (tagged header text or "", full page text, footer text)
+    """
+    # HEADER RECOVERY (Page 1 Only) - Critical for United & R. Lee
+    # For OCR path, we need high-res scan (300 DPI) for logos/letterheads
+    ocr_header_text = ""
+    if page_num == 0:
+        try:
+            # Page 1 was already rendered at 300 DPI
+            img_width, img_height = image.size
+            # OCR the Top 20% for header region
+            ocr_header_text = _ocr_image(image, (0, 0, img_width, int(img_height * 0.20)))
+            if len(ocr_header_text.strip()) > 5:
+                ocr_header_text = f"\n[HEADER_SCAN]:\n{ocr_header_text.strip()}\n"
+                logger.debug("OCR'd Header Text (OCR Path, Page 1, High-Res 300 DPI): %s", ocr_header_text.strip())
+        except Exception as e:
+            logger.debug("Header OCR failed (OCR path) for page 1: %s", e)
+    
+    # Extract full page text - ENSURE we pass the *entire* image height to OCR.
+    # Force footer extraction: the bottom 8% of the image comes out of the same pass.
+    page_text, footer_text = _ocr_page_and_footer(image, int(image.height * 0.92))
+    
+    return ocr_header_text, page_text, footer_text
+
+
+def _chars_within_bbox(chars: List[dict], bbox: Tuple[float, float, float, float]) -> List[dict]:
+    """Return the pdfplumber chars lying entirely inside bbox (same rule as page.within_bbox)."""
+    x0, top, x1, bottom = bbox
+    return [c for c in chars if c["x0"] >= x0 and c["x1"] <= x1 and c["top"] >= top and c["bottom"] <= bottom]
+
+
+def _has_graphics_in_bbox(page, bbox: Tuple[float, float, float, float]) -> bool:
+    """Check whether any embedded image or vector curve on a pdfplumber page overlaps bbox."""
+    x0, top, x1, bottom = bbox
+    for obj in (*page.images, *page.curves):
+        if obj["x0"] < x1 and obj["x1"] > x0 and obj["top"] < bottom and obj["bottom"] > top:
+            return True
+    return False
+
+
+def _looks_like_contact_info(text: str) -> bool:
+    """Check OCR'd footer text for contact info patterns (web, email, phone, common area codes)."""
+    return _FOOTER_PAT.search(text) is not None
+
+
+def _ocr_footer(page_image: Image.Image, downscale: bool = False) -> Tuple[str, float]:
+    """
+    OCR the footer strip of a rendered page.
+    
+    SURGICAL CROP: Only the bottom 8% (0.92) to avoid capturing bid table rows
+    (previous 15% (0.85) was catching table data like "Copper Water Service").
+    
+    Args:
+        page_image: Rendered page
+        downscale: Halve the crop first (for 300 DPI renders, see _downscale_half)
+    
+    Returns:
+        Tuple of (footer_text, mean word confidence 0-100)
+    """
+    img_width, img_height = page_image.size
+    footer_box = (0, int(img_height * 0.92), img_width, img_height)
+    if downscale:
+        return _ocr_image_with_confidence(_downscale_half(page_image.crop(footer_box)))
+    return _ocr_image_with_confidence(page_image, footer_box)
+
+
+def _downscale_half(image: Image.Image) -> Image.Image:
+    """
+    Halve an image's resolution (300 DPI -> ~150 DPI).
+    
+    Footer text is usually 10pt or larger, which is already oversized for Tesseract
+    at 300 DPI; ~150 DPI reads it fine with 4x fewer pixels for the LSTM.
+    """
+    return image.resize((max(1, image.width // 2), max(1, image.height // 2)), Image.LANCZOS)
+
+
+def _render_pages(pdf_path: str, page_numbers: Iterable[int], dpi: int) -> Dict[int, Image.Image]:
+    """
+    Render the given 1-based page numbers to images, each page exactly once.
+    
+    Contiguous page numbers are rendered with a single Poppler call, so the
+    usual first/last-page request costs at most two spawns instead of one per page.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: 1-based page numbers to render (duplicates are ignored)
+        dpi: Render resolution
+        
+    Returns:
+        Dict mapping page number to its rendered PIL image
+    """
+    images = {}
+    pages = sorted(set(page_numbers))
+    run_start = 0
+    for idx in range(1, len(pages) + 1):
+        # Close the current run at the end of the list or at a gap in page numbers
+        if idx == len(pages) or pages[idx] != pages[idx - 1] + 1:
+            first_page, last_page = pages[run_start], pages[idx - 1]
+            rendered = convert_from_path(pdf_path, first_page=first_page, last_page=last_page, dpi=dpi)
+            images.update(zip(range(first_page, last_page + 1), rendered))
+            run_start = idx
+    return images
+
+
 def _preprocess_contact_text(text: str) -> str:
     """
     Pre-process extracted text to improve contact extraction.
@@ -228,11 +517,5 @@ def _preprocess_contact_text(text: str) -> str:
     """
     # Fix "Contact:" patterns to "Contact Name:" for better LLM extraction
     # Pattern: "Contact: Nathaniel" -> "Contact Name: Nathaniel"
-    text = re.sub(
-        r'(?i)Contact:\s*([A-Za-z]+(?:\s+[A-Za-z]+)*)',
-        r'Contact Name: \1',
-        text
-    )
-    
-    return text
+    return _CONTACT_RE.sub(r'Contact Name: \1', text)
 